@@ -25,6 +25,7 @@ declare -a WORKER_FILES=(
     "src/transcription_worker.py"
     "src/transcription_worker_enhanced.py"
     "src/queue_metrics.py"
+    "src/s3_utils.py"
     "src/transcriber.py"
     "src/transcriber_gpu_optimized.py"
     "src/transcriber_faster_whisper.py"
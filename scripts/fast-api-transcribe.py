@@ -6,12 +6,38 @@ Supports S3 input/output, URL input, and file upload transcription
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import sys
 import os
 import time
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Stream multipart uploads from disk if requests-toolbelt is installed
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    STREAMING_UPLOAD_AVAILABLE = True
+except ImportError:
+    STREAMING_UPLOAD_AVAILABLE = False
+
+# orjson serializes large transcripts (word timestamps) much faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Auto-detected endpoint is cached between runs to skip describe_instances
+ENDPOINT_CACHE_FILE = Path.home() / ".cache" / "transcription-sqs" / "endpoint.json"
+ENDPOINT_CACHE_TTL = 300  # seconds
+
+# Concurrent requests in --s3-input-list batch mode
+DEFAULT_MAX_CONCURRENCY = 4
+
+@lru_cache(maxsize=1)
 def load_config():
     """Load configuration from .env file"""
     config = {}
@@ -27,14 +53,84 @@ def load_config():
                     config[key] = value
     return config
 
-def get_api_endpoint():
-    """Get Fast API endpoint from running instances or config"""
+def create_session(pool_maxsize=16):
+    """
+    Create a pooled keep-alive HTTP session shared by all API calls
+    
+    pool_maxsize should be at least the number of concurrent requests so
+    batch mode reuses connections instead of opening and discarding extras
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+def parse_response(response):
+    """Decode a JSON API response, straight from the body bytes when orjson is available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def check_health(session, api_endpoint):
+    """Probe /health, warming up the pooled connection for the main request"""
+    try:
+        response = session.get(f"{api_endpoint}/health", timeout=10)
+        response.raise_for_status()
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Health check failed: {e}")
+        return False
+
+def load_cached_endpoint(session):
+    """Return the cached endpoint if it is fresh and still answers /health"""
+    try:
+        with open(ENDPOINT_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if time.time() - cache['ts'] >= ENDPOINT_CACHE_TTL:
+            return None
+        response = session.get(f"{cache['endpoint']}/health", timeout=2)
+        if response.status_code == 200:
+            return cache['endpoint']
+    except (OSError, ValueError, KeyError, requests.exceptions.RequestException):
+        pass
+    return None
+
+def save_cached_endpoint(api_endpoint):
+    """Remember an auto-detected endpoint for subsequent runs"""
+    try:
+        ENDPOINT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(ENDPOINT_CACHE_FILE, 'w') as f:
+            json.dump({'endpoint': api_endpoint, 'ts': time.time()}, f)
+    except OSError as e:
+        print(f"⚠️ Could not cache API endpoint: {e}")
+
+def get_api_endpoint(session, use_cache=True):
+    """
+    Get Fast API endpoint from cache, running instances or config
+    
+    Returns (endpoint, verified) - verified is True when the endpoint came
+    from the cache and has just answered /health, so it needn't be probed again
+    """
     config = load_config()
     
+    if use_cache:
+        api_endpoint = load_cached_endpoint(session)
+        if api_endpoint:
+            return api_endpoint, True
+    
     # Try to find running Fast API instance
     try:
         import boto3
-        ec2 = boto3.client('ec2', region_name=config.get('AWS_REGION', 'us-east-2'))
+        from botocore.config import Config
+        ec2 = boto3.client('ec2', region_name=config.get('AWS_REGION', 'us-east-2'), config=Config(
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=30
+        ))
         
         response = ec2.describe_instances(
             Filters=[
@@ -47,19 +143,23 @@ def get_api_endpoint():
             for instance in reservation['Instances']:
                 public_ip = instance.get('PublicIpAddress')
                 if public_ip:
-                    return f"http://{public_ip}:8000"
-    except:
+                    api_endpoint = f"http://{public_ip}:8000"
+                    save_cached_endpoint(api_endpoint)
+                    return api_endpoint, False
+    except ImportError:
         pass
+    except Exception as e:
+        print(f"⚠️ Could not auto-detect Fast API instance: {e}")
     
     # Fallback to environment variable or ask user
     api_endpoint = config.get('FAST_API_ENDPOINT', os.environ.get('FAST_API_ENDPOINT'))
     if not api_endpoint:
         print("❌ No running Fast API instance found. Please specify --api-endpoint")
-        return None
+        return None, False
     
-    return api_endpoint
+    return api_endpoint, False
 
-def transcribe_s3(api_endpoint, s3_input, s3_output=None, return_text=True):
+def transcribe_s3(session, api_endpoint, s3_input, s3_output=None, return_text=True):
     """Transcribe audio from S3 with optional S3 output"""
     url = f"{api_endpoint}/transcribe-s3"
     
@@ -79,13 +179,13 @@ def transcribe_s3(api_endpoint, s3_input, s3_output=None, return_text=True):
     start_time = time.time()
     
     try:
-        response = requests.post(url, json=payload, timeout=1800)  # 30 min timeout
+        response = session.post(url, json=payload, timeout=1800)  # 30 min timeout
         response.raise_for_status()
         
         elapsed = time.time() - start_time
         print(f"✅ Transcription completed in {elapsed:.1f} seconds")
         
-        return response.json()
+        return parse_response(response)
         
     except requests.exceptions.Timeout:
         print("⏳ Request timed out (30 minutes) - large file may still be processing")
@@ -94,7 +194,7 @@ def transcribe_s3(api_endpoint, s3_input, s3_output=None, return_text=True):
         print(f"❌ Request failed: {e}")
         return None
 
-def transcribe_url(api_endpoint, audio_url):
+def transcribe_url(session, api_endpoint, audio_url):
     """Transcribe audio from URL"""
     url = f"{api_endpoint}/transcribe-url"
     
@@ -106,19 +206,19 @@ def transcribe_url(api_endpoint, audio_url):
     start_time = time.time()
     
     try:
-        response = requests.post(url, json=payload, timeout=1800)
+        response = session.post(url, json=payload, timeout=1800)
         response.raise_for_status()
         
         elapsed = time.time() - start_time
         print(f"✅ Transcription completed in {elapsed:.1f} seconds")
         
-        return response.json()
+        return parse_response(response)
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {e}")
         return None
 
-def transcribe_file(api_endpoint, file_path):
+def transcribe_file(session, api_endpoint, file_path):
     """Transcribe uploaded file"""
     url = f"{api_endpoint}/transcribe"
     
@@ -133,19 +233,97 @@ def transcribe_file(api_endpoint, file_path):
     
     try:
         with open(file_path, 'rb') as f:
-            files = {'file': f}
-            response = requests.post(url, files=files, timeout=1800)
+            if STREAMING_UPLOAD_AVAILABLE:
+                # Send the body in chunks straight from disk instead of building it in memory
+                encoder = MultipartEncoder(
+                    fields={'file': (os.path.basename(file_path), f, 'application/octet-stream')}
+                )
+                response = session.post(
+                    url,
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type},
+                    timeout=1800
+                )
+            else:
+                files = {'file': f}
+                response = session.post(url, files=files, timeout=1800)
             response.raise_for_status()
         
         elapsed = time.time() - start_time
         print(f"✅ Transcription completed in {elapsed:.1f} seconds")
         
-        return response.json()
+        return parse_response(response)
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {e}")
         return None
 
+def save_result(result, output_path):
+    """Write a transcript result to a local JSON file"""
+    if ORJSON_AVAILABLE:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+def load_input_list(list_path):
+    """Read S3 URIs from a file, one per line (blank lines and # comments skipped)"""
+    with open(list_path, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+def derive_output_name(s3_input):
+    """Transcript file name for a batch input, e.g. s3://bucket/shows/ep1.mp3 -> ep1.json"""
+    return Path(s3_input.rsplit('/', 1)[-1]).stem + '.json'
+
+def find_output_name_collisions(s3_inputs):
+    """Map each derived output name used by more than one input to those inputs"""
+    inputs_by_name = {}
+    for s3_input in s3_inputs:
+        inputs_by_name.setdefault(derive_output_name(s3_input), []).append(s3_input)
+    return {name: inputs for name, inputs in inputs_by_name.items() if len(inputs) > 1}
+
+def transcribe_s3_batch(session, api_endpoint, s3_inputs, max_concurrency,
+                        s3_output_prefix=None, output_dir=None, return_text=True):
+    """
+    Transcribe many S3 inputs concurrently over the shared session
+    
+    Results are saved as each request finishes, so slow files don't hold up
+    the rest. Returns the number of failed inputs.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    print(f"📦 Batch: {len(s3_inputs)} input(s), {max_concurrency} concurrent")
+    
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {}
+        for s3_input in s3_inputs:
+            s3_output = None
+            if s3_output_prefix:
+                s3_output = s3_output_prefix.rstrip('/') + '/' + derive_output_name(s3_input)
+            future = executor.submit(transcribe_s3, session, api_endpoint, s3_input, s3_output, return_text)
+            futures[future] = s3_input
+        
+        for future in as_completed(futures):
+            s3_input = futures[future]
+            result = future.result()
+            if not result:
+                failures += 1
+                print(f"❌ Failed: {s3_input}")
+                continue
+            
+            if output_dir:
+                output_path = os.path.join(output_dir, derive_output_name(s3_input))
+                save_result(result, output_path)
+                print(f"💾 {s3_input} -> {output_path}")
+            else:
+                print(f"✅ Done: {s3_input}")
+    
+    print(f"📊 Batch complete: {len(s3_inputs) - failures} succeeded, {failures} failed")
+    return failures
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fast API Transcription Client - S3-enhanced audio transcription",
@@ -169,6 +347,9 @@ Examples:
   
   # Save output to file
   %(prog)s --s3-input s3://bucket/audio.mp3 --output-file transcript.json
+  
+  # Batch: many S3 inputs, 4 at a time, transcripts saved locally
+  %(prog)s --s3-input-list inputs.txt --max-concurrency 4 --output-dir transcripts/
 
 Endpoints:
   /transcribe-s3   - S3 input/output (use s3:// URIs)
@@ -193,6 +374,10 @@ Endpoints:
         "--file", 
         help="Local file path for input audio"
     )
+    input_group.add_argument(
+        "--s3-input-list",
+        help="File with one S3 URI per line to transcribe as a batch"
+    )
     
     # Output options
     parser.add_argument(
@@ -203,6 +388,14 @@ Endpoints:
         "--output-file",
         help="Local file to save transcript JSON"
     )
+    parser.add_argument(
+        "--output-dir",
+        help="Directory for per-input transcript JSON in batch mode"
+    )
+    parser.add_argument(
+        "--s3-output-prefix",
+        help="S3 prefix for per-input transcripts in batch mode (e.g., s3://bucket/transcripts/)"
+    )
     parser.add_argument(
         "--no-s3-output",
         action="store_true",
@@ -214,6 +407,17 @@ Endpoints:
         "--api-endpoint",
         help="Fast API endpoint (auto-detected if not specified)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the cached auto-detected endpoint and look it up again"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Concurrent requests in batch mode (default: {DEFAULT_MAX_CONCURRENCY})"
+    )
     
     # Output options
     parser.add_argument(
@@ -229,9 +433,15 @@ Endpoints:
     
     args = parser.parse_args()
     
+    session = create_session(pool_maxsize=max(16, args.max_concurrency))
+    
     # Get API endpoint
-    api_endpoint = args.api_endpoint or get_api_endpoint()
+    if args.api_endpoint:
+        api_endpoint, endpoint_verified = args.api_endpoint, False
+    else:
+        api_endpoint, endpoint_verified = get_api_endpoint(session, use_cache=not args.no_cache)
     if not api_endpoint:
+        session.close()
         sys.exit(1)
     
     if not args.quiet:
@@ -242,24 +452,59 @@ Endpoints:
     # Determine transcription method and call appropriate function
     result = None
     
-    if args.s3_input:
-        s3_output = None if args.no_s3_output else args.s3_output
-        return_text = True if args.no_s3_output else bool(not args.quiet)
-        result = transcribe_s3(api_endpoint, args.s3_input, s3_output, return_text)
+    try:
+        # A cached endpoint was just health-checked while loading it
+        if not endpoint_verified:
+            check_health(session, api_endpoint)
         
-    elif args.url:
-        result = transcribe_url(api_endpoint, args.url)
+        if args.s3_input_list:
+            try:
+                s3_inputs = load_input_list(args.s3_input_list)
+            except OSError as e:
+                print(f"❌ Could not read {args.s3_input_list}: {e}")
+                sys.exit(1)
+            if not s3_inputs:
+                print(f"❌ No S3 inputs found in {args.s3_input_list}")
+                sys.exit(1)
+            s3_output_prefix = None if args.no_s3_output else args.s3_output_prefix
+            
+            # Outputs are named by file stem, so two inputs with the same stem
+            # would silently overwrite each other's transcript
+            if args.output_dir or s3_output_prefix:
+                collisions = find_output_name_collisions(s3_inputs)
+                if collisions:
+                    print(f"❌ Inputs in {args.s3_input_list} would write the same output file:")
+                    for name, inputs in collisions.items():
+                        print(f"  {name}: {', '.join(inputs)}")
+                    sys.exit(1)
+            
+            failures = transcribe_s3_batch(
+                session, api_endpoint, s3_inputs, max(1, args.max_concurrency),
+                s3_output_prefix=s3_output_prefix,
+                output_dir=args.output_dir,
+                return_text=bool(args.output_dir) or not s3_output_prefix
+            )
+            sys.exit(1 if failures else 0)
         
-    elif args.file:
-        result = transcribe_file(api_endpoint, args.file)
+        elif args.s3_input:
+            s3_output = None if args.no_s3_output else args.s3_output
+            return_text = True if args.no_s3_output else bool(not args.quiet)
+            result = transcribe_s3(session, api_endpoint, args.s3_input, s3_output, return_text)
+            
+        elif args.url:
+            result = transcribe_url(session, api_endpoint, args.url)
+            
+        elif args.file:
+            result = transcribe_file(session, api_endpoint, args.file)
+    finally:
+        session.close()
     
     if not result:
         sys.exit(1)
     
     # Handle output
     if args.output_file:
-        with open(args.output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        save_result(result, args.output_file)
         if not args.quiet:
             print(f"💾 Saved transcript to: {args.output_file}")
     
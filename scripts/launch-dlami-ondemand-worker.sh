@@ -185,7 +185,7 @@ cd /opt/transcription-worker
 
 # Docker-inspired PyTorch installation to prevent version conflicts
 # Pin pip and boto3 to stable versions
-pip3 install --upgrade pip==24.0 boto3==1.34.0
+pip3 install --upgrade pip==24.0 boto3==1.36.0 botocore==1.36.0
 
 # Force remove any existing PyTorch to avoid "Two Runtimes" conflict
 pip3 uninstall -y torch torchvision torchaudio triton 2>/dev/null || true
@@ -214,6 +214,7 @@ log_step "✅ Dependencies installed"
 
 aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/transcription_worker.py . --region REGION_PLACEHOLDER
 aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/queue_metrics.py . --region REGION_PLACEHOLDER
+aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/s3_utils.py . --region REGION_PLACEHOLDER
 aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/transcriber.py . --region REGION_PLACEHOLDER
 aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/transcriber_gpu_optimized.py . --region REGION_PLACEHOLDER
 aws s3 cp s3://METRICS_BUCKET_PLACEHOLDER/worker-code/latest/progress_logger.py . --region REGION_PLACEHOLDER
@@ -156,6 +156,7 @@ cd /opt/transcription-worker
 echo "📥 Downloading transcription worker code from S3..." | tee -a /var/log/gpu-test.log
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcription_worker.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/queue_metrics.py . --region $REGION || echo "Failed to download from S3"
+aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/s3_utils.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcriber.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcriber_gpu_optimized.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/progress_logger.py . --region $REGION || echo "Failed to download from S3"
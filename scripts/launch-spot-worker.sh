@@ -156,6 +156,7 @@ cd /opt/transcription-worker
 echo "📥 Downloading transcription worker code from S3..." | tee -a /var/log/gpu-test.log
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcription_worker.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/queue_metrics.py . --region $REGION || echo "Failed to download from S3"
+aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/s3_utils.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcriber.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/transcriber_gpu_optimized.py . --region $REGION || echo "Failed to download from S3"
 aws s3 cp s3://$METRICS_BUCKET/worker-code/latest/progress_logger.py . --region $REGION || echo "Failed to download from S3"
@@ -199,40 +200,26 @@ echo "  Queue URL: $QUEUE_URL"
 echo "  S3 Bucket: $S3_BUCKET"
 echo "  Region: $REGION"
 
-# Encode user data
-USER_DATA=$(base64 -w 0 < /tmp/user-data-gpu-proven.sh)
-
-# Request spot instance
-SPOT_REQUEST=$(aws ec2 request-spot-instances \
+# Launch the spot instance directly - run-instances returns the instance ID
+# immediately, no spot request to wait on and look up afterwards
+INSTANCE_ID=$(aws ec2 run-instances \
     --region "$REGION" \
-    --spot-price "$SPOT_PRICE" \
-    --instance-count 1 \
-    --launch-specification "{
-        \"ImageId\": \"$AMI_ID\",
-        \"InstanceType\": \"$INSTANCE_TYPE\",
-        \"KeyName\": \"$KEY_NAME\",
-        \"SecurityGroupIds\": [\"$SECURITY_GROUP_ID\"],
-        \"UserData\": \"$USER_DATA\",
-        \"IamInstanceProfile\": {
-            \"Name\": \"transcription-worker-profile\"
+    --image-id "$AMI_ID" \
+    --instance-type "$INSTANCE_TYPE" \
+    --key-name "$KEY_NAME" \
+    --security-group-ids "$SECURITY_GROUP_ID" \
+    --iam-instance-profile Name=transcription-worker-profile \
+    --user-data file:///tmp/user-data-gpu-proven.sh \
+    --instance-market-options "{
+        \"MarketType\": \"spot\",
+        \"SpotOptions\": {
+            \"MaxPrice\": \"$SPOT_PRICE\",
+            \"SpotInstanceType\": \"one-time\",
+            \"InstanceInterruptionBehavior\": \"terminate\"
         }
     }" \
-    --query 'SpotInstanceRequests[0].SpotInstanceRequestId' \
-    --output text)
-
-echo "GPU spot instance request created: $SPOT_REQUEST"
-
-# Wait for spot request to be fulfilled
-echo "Waiting for GPU spot instance to be launched..."
-aws ec2 wait spot-instance-request-fulfilled \
-    --region "$REGION" \
-    --spot-instance-request-ids "$SPOT_REQUEST"
-
-# Get instance ID
-INSTANCE_ID=$(aws ec2 describe-spot-instance-requests \
-    --region "$REGION" \
-    --spot-instance-request-ids "$SPOT_REQUEST" \
-    --query 'SpotInstanceRequests[0].InstanceId' \
+    --count 1 \
+    --query 'Instances[0].InstanceId' \
     --output text)
 
 echo "GPU spot instance launched: $INSTANCE_ID"
@@ -257,9 +244,10 @@ aws ec2 create-tags \
 echo "🎉 Instance tagged and ready!"
 echo "Instance ID: $INSTANCE_ID"
 
-# Get the instance IP
+# Get the instance IP (assigned once the instance is running)
 echo ""
 echo "Getting instance IP..."
+aws ec2 wait instance-running --region "$REGION" --instance-ids "$INSTANCE_ID"
 INSTANCE_IP=$(aws ec2 describe-instances --region "$REGION" --instance-ids "$INSTANCE_ID" --query 'Reservations[0].Instances[0].PublicIpAddress' --output text)
 echo "Instance IP: $INSTANCE_IP"
 echo ""
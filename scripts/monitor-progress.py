@@ -8,8 +8,49 @@ import json
 import time
 import sys
 import argparse
+import threading
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
+# Optional orjson for the status.json bodies polled every few seconds per job
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Default parallel S3 GETs when listing jobs/workers (client pool is sized to match)
+MAX_FETCH_WORKERS = 64
+
+# status.json is a few hundred bytes; listings only read this much of each blob
+STATUS_RANGE_BYTES = 4096
+
+# Adaptive poll interval for watch_job_progress (seconds)
+POLL_MIN_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 15.0
+POLL_NEAR_DONE_INTERVAL = 0.5
+POLL_WAITING_MAX_INTERVAL = 30.0
+
+# Progress bars for every 2% step, rendered once instead of on every update
+_BARS = [("█" * n).ljust(50, "░") for n in range(51)]
+
+STATUS_EMOJI = {
+    'STARTED': '🏃',
+    'DOWNLOADING': '📥',
+    'TRANSCRIBING': '🎙️',
+    'COMPLETED': '✅',
+    'FAILED': '❌'
+}
+WORKER_EMOJI = {True: '🟢', False: '🔴'}
+GPU_ICON = {True: '🚀', False: '💻'}
+
+# Serializes multi-line blocks so concurrent --watch-all updates don't interleave
+_OUTPUT_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
 def load_config():
     config = {}
     with open(".env", 'r') as f:
@@ -19,33 +60,95 @@ def load_config():
                 config[key.replace('export ', '').strip()] = value.strip().strip('"')
     return config
 
+def parse_json(body):
+    """Parse a JSON document from raw S3 body bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body.decode('utf-8'))
+
+def write_block(lines):
+    """Write a group of lines to stdout in one call"""
+    block = "\n".join(lines) + "\n"
+    with _OUTPUT_LOCK:
+        sys.stdout.write(block)
+        sys.stdout.flush()
+
 def format_duration(seconds):
     """Format seconds into human readable duration"""
+    seconds = int(seconds)
     if seconds < 60:
-        return f"{seconds:.1f}s"
+        return f"{seconds}s"
     elif seconds < 3600:
-        return f"{seconds/60:.1f}m"
+        return f"{seconds / 60:.1f}m"
     else:
-        return f"{seconds/3600:.1f}h"
+        return f"{seconds / 3600:.1f}h"
 
-def watch_job_progress(s3, bucket, job_id):
-    """Watch progress for a specific job"""
+def fetch_status_files(s3, bucket, keys, max_workers=MAX_FETCH_WORKERS):
+    """
+    Fetch and parse status.json objects concurrently
+    
+    Returns (key, data, last_modified, error) tuples in the same order as keys;
+    data is None for prefixes that have no status.json yet
+    """
+    def fetch(key):
+        try:
+            try:
+                response = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{STATUS_RANGE_BYTES - 1}")
+                body = response['Body'].read()
+                # ContentRange is "bytes 0-N/TOTAL" - refetch in full if the blob was cut off
+                total = int(response.get('ContentRange', '').rpartition('/')[2] or len(body))
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'InvalidRange':
+                    raise
+                total = None
+            if total is None or total > len(body):
+                response = s3.get_object(Bucket=bucket, Key=key)
+                body = response['Body'].read()
+            return key, parse_json(body), response['LastModified'], None
+        except s3.exceptions.NoSuchKey:
+            return key, None, None, None
+        except Exception as e:
+            return key, None, None, e
+    
+    if not keys:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        return list(executor.map(fetch, keys))
+
+def watch_job_progress(s3, bucket, job_id, stop_event=None):
+    """
+    Watch progress for a specific job
+    
+    When stop_event is given the watch runs alongside others (--watch-all):
+    update lines are tagged with the job id and the loop exits once it is set
+    """
+    tag = f"[{job_id[:12]}] " if stop_event else ""
+    stop_event = stop_event or threading.Event()
     progress_key = f"progress/{job_id}/status.json"
     log_key = f"progress/{job_id}/detailed_log.txt"
     
-    print(f"📊 Monitoring job: {job_id}")
-    print(f"Progress file: s3://{bucket}/{progress_key}")
-    print("=" * 60)
+    write_block([
+        f"📊 Monitoring job: {job_id}",
+        f"Progress file: s3://{bucket}/{progress_key}",
+        "=" * 60
+    ])
     
     last_percentage = None
+    last_etag = None
     start_time = time.time()
+    interval = POLL_MIN_INTERVAL
     
-    while True:
+    while not stop_event.is_set():
         try:
-            # Get progress status
+            # Get progress status (conditional GET skips the body when unchanged)
             try:
-                response = s3.get_object(Bucket=bucket, Key=progress_key)
-                progress_data = json.loads(response['Body'].read().decode('utf-8'))
+                if last_etag:
+                    response = s3.get_object(Bucket=bucket, Key=progress_key, IfNoneMatch=last_etag)
+                else:
+                    response = s3.get_object(Bucket=bucket, Key=progress_key)
+                last_etag = response['ETag']
+                progress_data = parse_json(response['Body'].read())
                 
                 status = progress_data.get('status', 'UNKNOWN')
                 message = progress_data.get('message', '')
@@ -54,32 +157,49 @@ def watch_job_progress(s3, bucket, job_id):
                 timestamp = progress_data.get('timestamp', '')
                 chunk_info = progress_data.get('chunk_info', {})
                 
+                # Poll faster while progress is moving, back off while it stalls
+                if status in ('DOWNLOADING', 'TRANSCRIBING') and percentage > 95:
+                    interval = POLL_NEAR_DONE_INTERVAL
+                elif percentage != last_percentage:
+                    interval = max(POLL_MIN_INTERVAL, interval * 0.5)
+                else:
+                    interval = min(POLL_MAX_INTERVAL, interval * 1.5)
+                
                 # Only print updates when percentage changes
                 if percentage != last_percentage:
-                    progress_bar = "█" * int(percentage / 2) + "░" * (50 - int(percentage / 2))
+                    progress_bar = _BARS[min(50, max(0, int(percentage / 2)))]
                     
-                    print(f"[{timestamp[:19]}] {status}")
-                    print(f"Progress: [{progress_bar}] {percentage}%")
-                    print(f"Status: {message}")
+                    lines = [
+                        f"{tag}[{timestamp[:19]}] {status}",
+                        f"Progress: [{progress_bar}] {percentage}%",
+                        f"Status: {message}",
+                    ]
                     if chunk_info:
-                        print(f"Chunks: {chunk_info.get('current', 0)}/{chunk_info.get('total', 0)}")
-                    print(f"Elapsed: {format_duration(elapsed)}")
-                    print("-" * 60)
+                        lines.append(f"Chunks: {chunk_info.get('current', 0)}/{chunk_info.get('total', 0)}")
+                    lines.append(f"Elapsed: {format_duration(elapsed)}")
+                    lines.append("-" * 60)
+                    write_block(lines)
                     
                     last_percentage = percentage
                 
                 # Check if completed
                 if status in ['COMPLETED', 'FAILED']:
-                    print(f"🎉 Job {status}: {message}")
-                    if status == 'COMPLETED':
-                        print("✅ Transcription completed successfully!")
-                    else:
-                        print("❌ Transcription failed!")
+                    write_block([
+                        f"{tag}🎉 Job {status}: {message}",
+                        f"{tag}✅ Transcription completed successfully!" if status == 'COMPLETED'
+                        else f"{tag}❌ Transcription failed!"
+                    ])
                     break
                     
             except s3.exceptions.NoSuchKey:
                 elapsed = time.time() - start_time
-                print(f"⏳ Waiting for job to start... ({format_duration(elapsed)} elapsed)")
+                print(f"{tag}⏳ Waiting for job to start... ({format_duration(elapsed)} elapsed)")
+                interval = min(POLL_WAITING_MAX_INTERVAL, interval * 1.5)
+            except ClientError as e:
+                # 304 Not Modified - status unchanged since the last poll
+                if e.response['Error']['Code'] not in ('304', 'NotModified'):
+                    raise
+                interval = min(POLL_MAX_INTERVAL, interval * 1.5)
                 
         except KeyboardInterrupt:
             print("\n⏹️ Monitoring stopped by user")
@@ -87,39 +207,69 @@ def watch_job_progress(s3, bucket, job_id):
         except Exception as e:
             print(f"Error monitoring progress: {e}")
             
-        time.sleep(10)  # Check every 10 seconds
+        stop_event.wait(interval)
 
-def list_active_jobs(s3, bucket):
+def watch_all_jobs(s3, bucket, jobs):
+    """Watch every unfinished job concurrently in one process"""
+    job_ids = [job['job_id'] for job in jobs if job['status'] not in ('COMPLETED', 'FAILED')]
+    if not job_ids:
+        print("📭 No running jobs to watch")
+        return
+    
+    print(f"📊 Watching {len(job_ids)} job(s) - press Ctrl+C to stop")
+    stop_event = threading.Event()
+    threads = [
+        threading.Thread(target=watch_job_progress, args=(s3, bucket, job_id, stop_event), daemon=True)
+        for job_id in job_ids
+    ]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        print("\n⏹️ Monitoring stopped by user")
+        stop_event.set()
+
+def list_active_jobs(s3, bucket, max_workers=MAX_FETCH_WORKERS):
     """List all active jobs with progress"""
     print("🔍 Scanning for active transcription jobs...")
     
     try:
-        # List all progress files
+        # List job prefixes under progress/
         paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket, Prefix='progress/')
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix='progress/',
+            Delimiter='/',
+            PaginationConfig={'PageSize': 1000}
+        )
+        
+        # One CommonPrefix per id - build status keys without listing every object
+        status_keys = [
+            prefix['Prefix'] + 'status.json'
+            for page in pages for prefix in page.get('CommonPrefixes', [])
+        ]
         
         jobs = []
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'].endswith('/status.json'):
-                        job_id = obj['Key'].split('/')[1]
-                        
-                        # Get job status
-                        try:
-                            response = s3.get_object(Bucket=bucket, Key=obj['Key'])
-                            progress_data = json.loads(response['Body'].read().decode('utf-8'))
-                            
-                            jobs.append({
-                                'job_id': job_id,
-                                'status': progress_data.get('status', 'UNKNOWN'),
-                                'percentage': progress_data.get('percentage', 0),
-                                'message': progress_data.get('message', ''),
-                                'elapsed': progress_data.get('elapsed_seconds', 0),
-                                'last_update': obj['LastModified']
-                            })
-                        except Exception as e:
-                            print(f"Error reading progress for {job_id}: {e}")
+        for key, progress_data, last_modified, error in fetch_status_files(s3, bucket, status_keys, max_workers):
+            job_id = key.split('/')[1]
+            if error:
+                print(f"Error reading progress for {job_id}: {error}")
+                continue
+            if progress_data is None:
+                continue
+            
+            jobs.append({
+                'job_id': job_id,
+                'status': progress_data.get('status', 'UNKNOWN'),
+                'percentage': progress_data.get('percentage', 0),
+                'message': progress_data.get('message', ''),
+                'elapsed': progress_data.get('elapsed_seconds', 0),
+                'last_update': last_modified
+            })
         
         if not jobs:
             print("📭 No active transcription jobs found")
@@ -132,20 +282,16 @@ def list_active_jobs(s3, bucket):
         print("=" * 80)
         
         for i, job in enumerate(jobs, 1):
-            status_emoji = {
-                'STARTED': '🏃',
-                'DOWNLOADING': '📥',
-                'TRANSCRIBING': '🎙️',
-                'COMPLETED': '✅',
-                'FAILED': '❌'
-            }.get(job['status'], '🔄')
+            status_emoji = STATUS_EMOJI.get(job['status'], '🔄')
             
-            print(f"{i}. Job ID: {job['job_id']}")
-            print(f"   Status: {status_emoji} {job['status']} ({job['percentage']}%)")
-            print(f"   Message: {job['message']}")
-            print(f"   Elapsed: {format_duration(job['elapsed'])}")
-            print(f"   Last Update: {job['last_update'].strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            print()
+            write_block([
+                f"{i}. Job ID: {job['job_id']}",
+                f"   Status: {status_emoji} {job['status']} ({job['percentage']}%)",
+                f"   Message: {job['message']}",
+                f"   Elapsed: {format_duration(job['elapsed'])}",
+                f"   Last Update: {job['last_update'].strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                ""
+            ])
             
         return jobs
         
@@ -153,39 +299,45 @@ def list_active_jobs(s3, bucket):
         print(f"Error listing jobs: {e}")
         return []
 
-def list_workers(s3, bucket):
+def list_workers(s3, bucket, max_workers=MAX_FETCH_WORKERS):
     """List active workers"""
     print("👷 Scanning for active workers...")
     
     try:
-        # List worker status files
+        # List worker prefixes under workers/
         paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket, Prefix='workers/')
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix='workers/',
+            Delimiter='/',
+            PaginationConfig={'PageSize': 1000}
+        )
+        
+        # One CommonPrefix per id - build status keys without listing every object
+        status_keys = [
+            prefix['Prefix'] + 'status.json'
+            for page in pages for prefix in page.get('CommonPrefixes', [])
+        ]
         
         workers = []
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'].endswith('/status.json'):
-                        worker_id = obj['Key'].split('/')[1]
-                        
-                        # Get worker status
-                        try:
-                            response = s3.get_object(Bucket=bucket, Key=obj['Key'])
-                            worker_data = json.loads(response['Body'].read().decode('utf-8'))
-                            
-                            workers.append({
-                                'worker_id': worker_id,
-                                'status': worker_data.get('status', 'UNKNOWN'),
-                                'started_at': worker_data.get('started_at', ''),
-                                'last_heartbeat': worker_data.get('last_heartbeat', ''),
-                                'jobs_processed': worker_data.get('jobs_processed', 0),
-                                'model': worker_data.get('model', ''),
-                                'gpu_optimized': worker_data.get('gpu_optimized', False),
-                                'last_update': obj['LastModified']
-                            })
-                        except Exception as e:
-                            print(f"Error reading worker status for {worker_id}: {e}")
+        for key, worker_data, last_modified, error in fetch_status_files(s3, bucket, status_keys, max_workers):
+            worker_id = key.split('/')[1]
+            if error:
+                print(f"Error reading worker status for {worker_id}: {error}")
+                continue
+            if worker_data is None:
+                continue
+            
+            workers.append({
+                'worker_id': worker_id,
+                'status': worker_data.get('status', 'UNKNOWN'),
+                'started_at': worker_data.get('started_at', ''),
+                'last_heartbeat': worker_data.get('last_heartbeat', ''),
+                'jobs_processed': worker_data.get('jobs_processed', 0),
+                'model': worker_data.get('model', ''),
+                'gpu_optimized': worker_data.get('gpu_optimized', False),
+                'last_update': last_modified
+            })
         
         if not workers:
             print("🚫 No active workers found")
@@ -195,16 +347,18 @@ def list_workers(s3, bucket):
         print("=" * 80)
         
         for i, worker in enumerate(workers, 1):
-            status_emoji = '🟢' if worker['status'] == 'RUNNING' else '🔴'
-            gpu_icon = '🚀' if worker['gpu_optimized'] else '💻'
+            status_emoji = WORKER_EMOJI[worker['status'] == 'RUNNING']
+            gpu_icon = GPU_ICON[bool(worker['gpu_optimized'])]
             
-            print(f"{i}. Worker: {worker['worker_id'][:12]}...")
-            print(f"   Status: {status_emoji} {worker['status']}")
-            print(f"   Type: {gpu_icon} {worker['model']} ({'GPU-Optimized' if worker['gpu_optimized'] else 'Standard'})")
-            print(f"   Jobs Processed: {worker['jobs_processed']}")
-            print(f"   Started: {worker['started_at'][:19] if worker['started_at'] else 'Unknown'}")
-            print(f"   Last Heartbeat: {worker['last_heartbeat'][:19] if worker['last_heartbeat'] else 'Unknown'}")
-            print()
+            write_block([
+                f"{i}. Worker: {worker['worker_id'][:12]}...",
+                f"   Status: {status_emoji} {worker['status']}",
+                f"   Type: {gpu_icon} {worker['model']} ({'GPU-Optimized' if worker['gpu_optimized'] else 'Standard'})",
+                f"   Jobs Processed: {worker['jobs_processed']}",
+                f"   Started: {worker['started_at'][:19] if worker['started_at'] else 'Unknown'}",
+                f"   Last Heartbeat: {worker['last_heartbeat'][:19] if worker['last_heartbeat'] else 'Unknown'}",
+                ""
+            ])
             
     except Exception as e:
         print(f"Error listing workers: {e}")
@@ -214,8 +368,11 @@ def main():
     parser.add_argument('--job-id', help='Specific job ID to monitor')
     parser.add_argument('--list-jobs', action='store_true', help='List all active jobs')
     parser.add_argument('--list-workers', action='store_true', help='List all active workers')
+    parser.add_argument('--watch-all', action='store_true', help='Watch all unfinished jobs at once')
     parser.add_argument('--bucket', help='S3 bucket (override config)')
     parser.add_argument('--region', help='AWS region (override config)')
+    parser.add_argument('--max-workers', type=int, default=MAX_FETCH_WORKERS,
+                        help=f'Parallel S3 requests when listing (default: {MAX_FETCH_WORKERS})')
     
     args = parser.parse_args()
     
@@ -229,15 +386,24 @@ def main():
         sys.exit(1)
     
     # Initialize S3 client
-    s3 = boto3.client('s3', region_name=region)
+    s3 = boto3.client('s3', region_name=region, config=Config(
+        max_pool_connections=args.max_workers,
+        retries={'mode': 'adaptive', 'max_attempts': 5},
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30
+    ))
     
     if args.list_workers:
-        list_workers(s3, bucket)
+        list_workers(s3, bucket, args.max_workers)
+    elif args.watch_all:
+        jobs = list_active_jobs(s3, bucket, args.max_workers) or []
+        watch_all_jobs(s3, bucket, jobs)
     elif args.list_jobs:
-        jobs = list_active_jobs(s3, bucket)
+        jobs = list_active_jobs(s3, bucket, args.max_workers)
         
-        # Interactive selection
-        if jobs and not args.job_id:
+        # Interactive selection (skipped when run from cron/CI without a TTY)
+        if jobs and not args.job_id and sys.stdin.isatty():
             try:
                 choice = input("\nEnter job number to monitor (or press Enter to exit): ").strip()
                 if choice and choice.isdigit():
@@ -256,14 +422,15 @@ def main():
         print("=" * 40)
         print()
         
-        list_workers(s3, bucket)
+        list_workers(s3, bucket, args.max_workers)
         print()
-        list_active_jobs(s3, bucket)
+        list_active_jobs(s3, bucket, args.max_workers)
         
         print("\nOptions:")
         print("  --list-jobs      List and optionally monitor jobs")
         print("  --list-workers   List active workers")
         print("  --job-id <id>    Monitor specific job")
+        print("  --watch-all      Monitor all unfinished jobs")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -5,21 +5,118 @@ System Health Monitor - Detect stuck workers and failed jobs
 
 import boto3
 import json
+import re
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 
-def load_config():
-    config = {}
-    with open(".env", 'r') as f:
-        for line in f:
-            if line.strip() and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                config[key.replace('export ', '').strip()] = value.strip().strip('"')
-    return config
+# Optional orjson for the worker and job status files parsed in bulk each check
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Default parallel S3 GETs for worker/job status files (client pool is sized to match)
+MAX_FETCH_WORKERS = 32
+
+HEADER = "=" * 60
+
+# CloudWatch namespace for --publish-metrics
+METRICS_NAMESPACE = 'Transcription/Health'
+
+# With --events-queue-url, re-read all status files at least this often (in checks)
+FULL_RECONCILE_EVERY = 10
+
+# Heartbeat rollup maintained by the enhanced workers
+WORKER_INDEX_KEY = 'workers/_index.json'
+
+# KEY=value / export KEY="value" lines; '#' comment lines never match
+# Trailing \r is matched as whitespace so CRLF (Windows-edited) files parse cleanly
+_CONFIG_LINE_RE = re.compile(r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"?(.*?)"?[ \t\r]*$', re.M)
+
+def load_config(path=".env"):
+    with open(path, 'r') as f:
+        return dict(_CONFIG_LINE_RE.findall(f.read()))
+
+def parse_json(body):
+    """Parse a JSON document from raw S3 body bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body.decode('utf-8'))
+
+def age_minutes_since(timestamp, now_ts):
+    """
+    Minutes elapsed since an ISO-8601 timestamp
+    
+    Naive timestamps are treated as UTC; missing or malformed values count as
+    infinitely old
+    """
+    if not timestamp:
+        return float('inf')
+    try:
+        parsed = datetime.fromisoformat(timestamp[:-1] if timestamp.endswith('Z') else timestamp)
+    except ValueError:
+        return float('inf')
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (now_ts - parsed.timestamp()) / 60
+
+def fetch_status_files(s3, bucket, keys, max_workers=MAX_FETCH_WORKERS):
+    """
+    Fetch and parse status.json objects concurrently
+    
+    Returns (key, data, error) tuples in the same order as keys; ids that
+    have no status.json yet are left out
+    """
+    def fetch(key):
+        try:
+            response = s3.get_object(Bucket=bucket, Key=key)
+            return key, parse_json(response['Body'].read()), None
+        except s3.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            return key, None, e
+    
+    if not keys:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        return [result for result in executor.map(fetch, keys) if result is not None]
+
+def list_status_keys(s3, bucket, prefix):
+    """
+    Build the <id>/status.json key for every id under a prefix
+    
+    Lists with a delimiter so S3 returns one CommonPrefix per worker/job
+    instead of every object (logs, transcripts) stored beneath it
+    """
+    paginator = s3.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=bucket,
+        Prefix=prefix,
+        Delimiter='/',
+        PaginationConfig={'PageSize': 1000}
+    )
+    return [
+        common_prefix['Prefix'] + 'status.json'
+        for page in pages
+        for common_prefix in page.get('CommonPrefixes', [])
+    ]
+
+def load_worker_index(s3, bucket):
+    """Read worker statuses from the heartbeat rollup (None if no worker has written it yet)"""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=WORKER_INDEX_KEY)
+    except s3.exceptions.NoSuchKey:
+        return None
+    return parse_json(response['Body'].read()).get('workers', {})
 
 def check_queue_health(sqs, queue_url):
     """Check if messages are stuck in queue"""
+    report = []
     try:
         attrs = sqs.get_queue_attributes(
             QueueUrl=queue_url,
@@ -29,83 +126,95 @@ def check_queue_health(sqs, queue_url):
         visible_messages = int(attrs.get('ApproximateNumberOfMessages', 0))
         inflight_messages = int(attrs.get('ApproximateNumberOfMessagesNotVisible', 0))
         
-        print("📊 QUEUE HEALTH CHECK")
-        print("=" * 30)
-        print(f"Messages in queue: {visible_messages}")
-        print(f"Messages in-flight: {inflight_messages}")
+        report.append("📊 QUEUE HEALTH CHECK")
+        report.append("=" * 30)
+        report.append(f"Messages in queue: {visible_messages}")
+        report.append(f"Messages in-flight: {inflight_messages}")
         
         # Check for stuck messages (in-flight > 30 minutes)
         if inflight_messages > 0:
-            print("⚠️ WARNING: Messages are in-flight")
-            print("This could indicate:")
-            print("  - Workers are processing (normal)")
-            print("  - Workers crashed (problem)")
-            print("  - Messages stuck due to errors (problem)")
+            report.append("⚠️ WARNING: Messages are in-flight")
+            report.append("This could indicate:")
+            report.append("  - Workers are processing (normal)")
+            report.append("  - Workers crashed (problem)")
+            report.append("  - Messages stuck due to errors (problem)")
         
         return {
+            'report': report,
             'visible': visible_messages,
             'inflight': inflight_messages,
             'healthy': inflight_messages == 0 or visible_messages == 0
         }
     except Exception as e:
-        print(f"❌ Error checking queue: {e}")
-        return {'healthy': False, 'error': str(e)}
+        report.append(f"❌ Error checking queue: {e}")
+        return {'healthy': False, 'error': str(e), 'report': report}
 
-def check_worker_health(s3, bucket):
-    """Check worker heartbeats and detect stale workers"""
+def check_worker_health(s3, bucket, max_workers=MAX_FETCH_WORKERS, record_cache=None, refresh=True):
+    """
+    Check worker heartbeats and detect stale workers
+    
+    With refresh=False the status records saved in record_cache by the last
+    refresh are re-evaluated against the current time instead of re-read from S3
+    """
+    report = []
     try:
-        print("\n👷 WORKER HEALTH CHECK")
-        print("=" * 30)
+        report.append("\n👷 WORKER HEALTH CHECK")
+        report.append("=" * 30)
         
-        # List worker status files
-        paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket, Prefix='workers/')
+        if not refresh and record_cache is not None and 'workers' in record_cache:
+            worker_records = record_cache['workers']
+        else:
+            # One GET for the heartbeat rollup; scan per-worker status files if it doesn't exist
+            worker_index = load_worker_index(s3, bucket)
+            if worker_index is not None:
+                worker_records = [(worker_id, data, None) for worker_id, data in worker_index.items()]
+            else:
+                status_keys = list_status_keys(s3, bucket, 'workers/')
+                worker_records = [
+                    (key.split('/')[1], data, error)
+                    for key, data, error in fetch_status_files(s3, bucket, status_keys, max_workers)
+                ]
+            if record_cache is not None:
+                record_cache['workers'] = worker_records
         
         workers = []
-        now = datetime.utcnow()
-        
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'].endswith('/status.json'):
-                        worker_id = obj['Key'].split('/')[1]
-                        
-                        try:
-                            response = s3.get_object(Bucket=bucket, Key=obj['Key'])
-                            worker_data = json.loads(response['Body'].read().decode('utf-8'))
-                            
-                            last_heartbeat = worker_data.get('last_heartbeat', '')
-                            if last_heartbeat:
-                                heartbeat_time = datetime.fromisoformat(last_heartbeat.replace('Z', '+00:00'))
-                                age_minutes = (now - heartbeat_time.replace(tzinfo=None)).total_seconds() / 60
-                            else:
-                                age_minutes = float('inf')
-                            
-                            workers.append({
-                                'worker_id': worker_id,
-                                'status': worker_data.get('status', 'UNKNOWN'),
-                                'age_minutes': age_minutes,
-                                'jobs_processed': worker_data.get('jobs_processed', 0),
-                                'healthy': age_minutes < 5  # Heartbeat within 5 minutes
-                            })
-                            
-                        except Exception as e:
-                            print(f"Error reading worker {worker_id}: {e}")
+        now_ts = time.time()
+        
+        for worker_id, worker_data, error in worker_records:
+            try:
+                if error:
+                    raise error
+                
+                age_minutes = age_minutes_since(worker_data.get('last_heartbeat', ''), now_ts)
+                
+                workers.append({
+                    'worker_id': worker_id,
+                    'status': worker_data.get('status', 'UNKNOWN'),
+                    'age_minutes': age_minutes,
+                    'jobs_processed': worker_data.get('jobs_processed', 0),
+                    'healthy': age_minutes < 5  # Heartbeat within 5 minutes
+                })
+                
+            except Exception as e:
+                report.append(f"Error reading worker {worker_id}: {e}")
         
         if not workers:
-            print("🚫 No workers found")
-            return {'workers': [], 'healthy': True}  # No workers is fine if no jobs
+            report.append("🚫 No workers found")
+            return {'workers': [], 'healthy_count': 0, 'stale_count': 0, 'healthy': True, 'report': report}  # No workers is fine if no jobs
         
-        healthy_workers = [w for w in workers if w['healthy']]
-        stale_workers = [w for w in workers if not w['healthy']]
+        # Single pass over the workers instead of one filter per bucket
+        healthy_workers, stale_workers = [], []
+        for worker in workers:
+            (healthy_workers if worker['healthy'] else stale_workers).append(worker)
         
-        print(f"✅ Healthy workers: {len(healthy_workers)}")
-        print(f"⚠️ Stale workers: {len(stale_workers)}")
+        report.append(f"✅ Healthy workers: {len(healthy_workers)}")
+        report.append(f"⚠️ Stale workers: {len(stale_workers)}")
         
         for worker in stale_workers:
-            print(f"  - {worker['worker_id'][:12]}... (stale for {worker['age_minutes']:.1f} min)")
+            report.append(f"  - {worker['worker_id'][:12]}... (stale for {worker['age_minutes']:.1f} min)")
         
         return {
+            'report': report,
             'workers': workers,
             'healthy_count': len(healthy_workers),
             'stale_count': len(stale_workers),
@@ -113,67 +222,75 @@ def check_worker_health(s3, bucket):
         }
         
     except Exception as e:
-        print(f"❌ Error checking workers: {e}")
-        return {'healthy': False, 'error': str(e)}
+        report.append(f"❌ Error checking workers: {e}")
+        return {'healthy': False, 'error': str(e), 'report': report}
 
-def check_job_health(s3, bucket):
-    """Check for stuck or failed jobs"""
+def check_job_health(s3, bucket, max_workers=MAX_FETCH_WORKERS, record_cache=None, refresh=True):
+    """
+    Check for stuck or failed jobs
+    
+    record_cache/refresh behave as in check_worker_health
+    """
+    report = []
     try:
-        print("\n📋 JOB HEALTH CHECK")
-        print("=" * 30)
+        report.append("\n📋 JOB HEALTH CHECK")
+        report.append("=" * 30)
         
-        # List progress files
-        paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=bucket, Prefix='progress/')
+        if not refresh and record_cache is not None and 'jobs' in record_cache:
+            job_records = record_cache['jobs']
+        else:
+            # List progress files, then fetch them in parallel
+            status_keys = list_status_keys(s3, bucket, 'progress/')
+            job_records = fetch_status_files(s3, bucket, status_keys, max_workers)
+            if record_cache is not None:
+                record_cache['jobs'] = job_records
         
         jobs = []
-        now = datetime.utcnow()
-        
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    if obj['Key'].endswith('/status.json'):
-                        job_id = obj['Key'].split('/')[1]
-                        
-                        try:
-                            response = s3.get_object(Bucket=bucket, Key=obj['Key'])
-                            progress_data = json.loads(response['Body'].read().decode('utf-8'))
-                            
-                            last_update = progress_data.get('last_update', '')
-                            if last_update:
-                                update_time = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-                                age_minutes = (now - update_time.replace(tzinfo=None)).total_seconds() / 60
-                            else:
-                                age_minutes = float('inf')
-                            
-                            status = progress_data.get('status', 'UNKNOWN')
-                            percentage = progress_data.get('percentage', 0)
-                            
-                            jobs.append({
-                                'job_id': job_id,
-                                'status': status,
-                                'percentage': percentage,
-                                'age_minutes': age_minutes,
-                                'stuck': status not in ['COMPLETED', 'FAILED'] and age_minutes > 10
-                            })
-                            
-                        except Exception as e:
-                            print(f"Error reading job {job_id}: {e}")
+        now_ts = time.time()
+        
+        for key, progress_data, error in job_records:
+            job_id = key.split('/')[1]
+            
+            try:
+                if error:
+                    raise error
+                
+                age_minutes = age_minutes_since(progress_data.get('last_update') or progress_data.get('timestamp', ''), now_ts)
+                
+                status = progress_data.get('status', 'UNKNOWN')
+                percentage = progress_data.get('percentage', 0)
+                
+                jobs.append({
+                    'job_id': job_id,
+                    'status': status,
+                    'percentage': percentage,
+                    'age_minutes': age_minutes,
+                    'stuck': status not in ['COMPLETED', 'FAILED'] and age_minutes > 10
+                })
+                
+            except Exception as e:
+                report.append(f"Error reading job {job_id}: {e}")
         
         if not jobs:
-            print("📭 No active jobs found")
-            return {'jobs': [], 'healthy': True}
+            report.append("📭 No active jobs found")
+            return {'jobs': [], 'active_count': 0, 'stuck_count': 0, 'healthy': True, 'report': report}
         
-        active_jobs = [j for j in jobs if j['status'] not in ['COMPLETED', 'FAILED']]
-        stuck_jobs = [j for j in jobs if j['stuck']]
+        # Single pass over the jobs instead of one filter per bucket
+        active_jobs, stuck_jobs = [], []
+        for job in jobs:
+            if job['status'] not in ('COMPLETED', 'FAILED'):
+                active_jobs.append(job)
+            if job['stuck']:
+                stuck_jobs.append(job)
         
-        print(f"🔄 Active jobs: {len(active_jobs)}")
-        print(f"⚠️ Stuck jobs: {len(stuck_jobs)}")
+        report.append(f"🔄 Active jobs: {len(active_jobs)}")
+        report.append(f"⚠️ Stuck jobs: {len(stuck_jobs)}")
         
         for job in stuck_jobs:
-            print(f"  - {job['job_id']} ({job['status']}, {job['percentage']}%, stale {job['age_minutes']:.1f} min)")
+            report.append(f"  - {job['job_id']} ({job['status']}, {job['percentage']}%, stale {job['age_minutes']:.1f} min)")
         
         return {
+            'report': report,
             'jobs': jobs,
             'active_count': len(active_jobs),
             'stuck_count': len(stuck_jobs),
@@ -181,47 +298,124 @@ def check_job_health(s3, bucket):
         }
         
     except Exception as e:
-        print(f"❌ Error checking jobs: {e}")
-        return {'healthy': False, 'error': str(e)}
+        report.append(f"❌ Error checking jobs: {e}")
+        return {'healthy': False, 'error': str(e), 'report': report}
+
+INSTANCE_PROJECTION = (
+    "Reservations[].Instances[].[InstanceId, State.Name, LaunchTime, InstanceType, "
+    "Tags[?Key=='Name'] | [0].Value]"
+)
+
+def list_worker_instances(ec2):
+    """Return running/pending whisper-worker instances"""
+    # Page through the results and project only the fields the report uses
+    paginator = ec2.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=[
+            {"Name": "tag:Type", "Values": ["whisper-worker"]},
+            {"Name": "instance-state-name", "Values": ["running", "pending"]}
+        ]
+    )
+    
+    running_instances = []
+    for instance_id, state, launch_time, instance_type, name in pages.search(INSTANCE_PROJECTION):
+        running_instances.append({
+            'instance_id': instance_id,
+            'name': name or 'Unknown',
+            'state': state,
+            'type': instance_type,
+            'launch_time': launch_time
+        })
+    return running_instances
 
 def check_ec2_instances(ec2, region):
     """Check running transcription instances"""
+    report = []
     try:
-        print("\n🖥️ EC2 INSTANCE CHECK")
-        print("=" * 30)
+        report.append("\n🖥️ EC2 INSTANCE CHECK")
+        report.append("=" * 30)
         
-        instances = ec2.describe_instances(
-            Filters=[
-                {"Name": "tag:Type", "Values": ["whisper-worker"]},
-                {"Name": "instance-state-name", "Values": ["running", "pending"]}
-            ]
-        )
-        
-        running_instances = []
-        for reservation in instances['Reservations']:
-            for instance in reservation['Instances']:
-                name = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), 'Unknown')
-                running_instances.append({
-                    'instance_id': instance['InstanceId'],
-                    'name': name,
-                    'state': instance['State']['Name'],
-                    'type': instance['InstanceType'],
-                    'launch_time': instance['LaunchTime']
-                })
+        running_instances = list_worker_instances(ec2)
         
-        print(f"🖥️ Running instances: {len(running_instances)}")
+        report.append(f"🖥️ Running instances: {len(running_instances)}")
         for instance in running_instances:
-            print(f"  - {instance['name']} ({instance['instance_id']}) - {instance['state']}")
+            report.append(f"  - {instance['name']} ({instance['instance_id']}) - {instance['state']}")
         
         return {
+            'report': report,
             'instances': running_instances,
             'count': len(running_instances),
             'healthy': True  # Just informational
         }
         
     except Exception as e:
-        print(f"❌ Error checking instances: {e}")
-        return {'healthy': False, 'error': str(e)}
+        report.append(f"❌ Error checking instances: {e}")
+        return {'healthy': False, 'error': str(e), 'report': report}
+
+def drain_status_events(sqs, events_queue_url, wait_seconds):
+    """
+    Drain S3 event notifications for worker/job status objects
+    
+    Accepts both direct S3 notifications and EventBridge "Object Created"
+    events. Returns True if any workers/ or progress/ status object changed.
+    """
+    changed = False
+    wait = wait_seconds
+    
+    while True:
+        response = sqs.receive_message(
+            QueueUrl=events_queue_url,
+            MaxNumberOfMessages=10,
+            WaitTimeSeconds=wait
+        )
+        messages = response.get('Messages', [])
+        if not messages:
+            return changed
+        
+        for message in messages:
+            try:
+                event = json.loads(message['Body'])
+            except ValueError:
+                continue
+            if 'Records' in event:
+                keys = [record.get('s3', {}).get('object', {}).get('key', '') for record in event['Records']]
+            else:
+                keys = [event.get('detail', {}).get('object', {}).get('key', '')]
+            if any(key.startswith(('workers/', 'progress/')) for key in keys):
+                changed = True
+        
+        sqs.delete_message_batch(
+            QueueUrl=events_queue_url,
+            Entries=[
+                {'Id': str(i), 'ReceiptHandle': message['ReceiptHandle']}
+                for i, message in enumerate(messages)
+            ]
+        )
+        wait = 0  # Got a batch - keep draining without blocking
+
+def publish_health_metrics(cloudwatch, region, queue_health, worker_health, job_health,
+                           instance_health, all_healthy):
+    """Publish the health check results as CloudWatch custom metrics"""
+    values = [
+        ('QueueVisibleMessages', queue_health.get('visible')),
+        ('QueueInflightMessages', queue_health.get('inflight')),
+        ('HealthyWorkers', worker_health.get('healthy_count')),
+        ('StaleWorkers', worker_health.get('stale_count')),
+        ('ActiveJobs', job_health.get('active_count')),
+        ('StuckJobs', job_health.get('stuck_count')),
+        ('RunningInstances', instance_health.get('count')),
+        ('SystemHealthy', int(all_healthy)),
+    ]
+    dimensions = [{'Name': 'Region', 'Value': region}]
+    metric_data = [
+        {'MetricName': name, 'Value': value, 'Unit': 'Count', 'Dimensions': dimensions}
+        for name, value in values
+        if value is not None  # Skip checks that errored
+    ]
+    
+    # PutMetricData accepts at most 20 datums per call
+    for i in range(0, len(metric_data), 20):
+        cloudwatch.put_metric_data(Namespace=METRICS_NAMESPACE, MetricData=metric_data[i:i + 20])
 
 def send_alert(message):
     """Send alert about system issues (placeholder)"""
@@ -238,26 +432,50 @@ def main():
     parser = argparse.ArgumentParser(description='Monitor transcription system health')
     parser.add_argument('--continuous', action='store_true', help='Run continuous monitoring')
     parser.add_argument('--interval', type=int, default=60, help='Check interval in seconds')
+    parser.add_argument('--max-workers', type=int, default=MAX_FETCH_WORKERS,
+                        help=f'Parallel S3 requests for status files (default: {MAX_FETCH_WORKERS})')
+    parser.add_argument('--events-queue-url',
+                        help='SQS queue receiving S3 events for workers/ and progress/; '
+                             'continuous mode only re-reads status files when events arrive')
+    parser.add_argument('--publish-metrics', action='store_true',
+                        help=f'Publish results as CloudWatch metrics in the {METRICS_NAMESPACE} namespace')
     
     args = parser.parse_args()
     
     config = load_config()
     
-    # Initialize AWS clients
-    sqs = boto3.client('sqs', region_name=config['AWS_REGION'])
-    s3 = boto3.client('s3', region_name=config['AWS_REGION'])
-    ec2 = boto3.client('ec2', region_name=config['AWS_REGION'])
+    # Initialize AWS clients (adaptive retries back off under throttling)
+    client_config = Config(retries={'max_attempts': 5, 'mode': 'adaptive'}, tcp_keepalive=True)
+    sqs = boto3.client('sqs', region_name=config['AWS_REGION'], config=client_config)
+    # Worker and job checks fan out at the same time, so the pool covers both
+    s3 = boto3.client('s3', region_name=config['AWS_REGION'],
+                      config=client_config.merge(Config(max_pool_connections=args.max_workers * 2)))
+    ec2 = boto3.client('ec2', region_name=config['AWS_REGION'], config=client_config)
+    cloudwatch = boto3.client('cloudwatch', region_name=config['AWS_REGION'],
+                              config=client_config) if args.publish_metrics else None
+    record_cache = {}
     
-    def run_health_check():
+    def run_health_check(refresh=True):
         print(f"\n🔍 TRANSCRIPTION SYSTEM HEALTH CHECK")
         print(f"Timestamp: {datetime.now().isoformat()}")
-        print("=" * 60)
-        
-        # Run all health checks
-        queue_health = check_queue_health(sqs, config['QUEUE_URL'])
-        worker_health = check_worker_health(s3, config['METRICS_BUCKET'])
-        job_health = check_job_health(s3, config['METRICS_BUCKET'])
-        instance_health = check_ec2_instances(ec2, config['AWS_REGION'])
+        print(HEADER)
+        
+        # Run all health checks concurrently - they hit independent AWS endpoints
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            queue_future = executor.submit(check_queue_health, sqs, config['QUEUE_URL'])
+            worker_future = executor.submit(check_worker_health, s3, config['METRICS_BUCKET'],
+                                            args.max_workers, record_cache, refresh)
+            job_future = executor.submit(check_job_health, s3, config['METRICS_BUCKET'],
+                                         args.max_workers, record_cache, refresh)
+            instance_future = executor.submit(check_ec2_instances, ec2, config['AWS_REGION'])
+            queue_health = queue_future.result()
+            worker_health = worker_future.result()
+            job_health = job_future.result()
+            instance_health = instance_future.result()
+        
+        # Print each check's report in a fixed order
+        for health in (queue_health, worker_health, job_health, instance_health):
+            print("\n".join(health['report']))
         
         # Overall system health
         all_healthy = all([
@@ -286,22 +504,62 @@ def main():
             alert_message = "System health issues detected:\n" + "\n".join(f"  - {issue}" for issue in issues)
             send_alert(alert_message)
         
+        if cloudwatch:
+            try:
+                publish_health_metrics(cloudwatch, config['AWS_REGION'], queue_health, worker_health,
+                                       job_health, instance_health, all_healthy)
+            except Exception as e:
+                print(f"⚠️ Could not publish CloudWatch metrics: {e}")
+        
         return all_healthy
     
     if args.continuous:
         print("🔄 Starting continuous health monitoring...")
         print(f"Check interval: {args.interval} seconds")
         
+        if args.events_queue_url:
+            print(f"Status events: {args.events_queue_url}")
+        
+        # Schedule checks on a fixed cadence so check duration doesn't add drift
+        next_check = time.monotonic()
+        refresh = True
+        checks_since_refresh = 0
         while True:
             try:
-                run_health_check()
-                time.sleep(args.interval)
+                run_health_check(refresh)
             except KeyboardInterrupt:
                 print("\n⏹️ Monitoring stopped by user")
                 break
             except Exception as e:
                 print(f"\n❌ Error in health check: {e}")
-                time.sleep(args.interval)
+            
+            try:
+                next_check += args.interval
+                checks_since_refresh = 0 if refresh else checks_since_refresh + 1
+                
+                if args.events_queue_url:
+                    # Re-read status files only when something changed (or periodically, in case
+                    # an event was missed); otherwise cached heartbeats are re-aged next tick
+                    refresh = checks_since_refresh + 1 >= FULL_RECONCILE_EVERY
+                    remaining = next_check - time.monotonic()
+                    while remaining > 0:
+                        wait_seconds = min(20, int(remaining))
+                        if wait_seconds == 0:
+                            time.sleep(remaining)
+                            break
+                        try:
+                            if drain_status_events(sqs, args.events_queue_url, wait_seconds):
+                                refresh = True
+                        except Exception as e:
+                            print(f"⚠️ Error reading status events: {e}")
+                            refresh = True
+                            time.sleep(max(0, next_check - time.monotonic()))
+                        remaining = next_check - time.monotonic()
+                else:
+                    time.sleep(max(0, next_check - time.monotonic()))
+            except KeyboardInterrupt:
+                print("\n⏹️ Monitoring stopped by user")
+                break
     else:
         run_health_check()
 
@@ -8,13 +8,22 @@ import sys
 import re
 import os
 import uuid
-from datetime import datetime
+import time
 from pathlib import Path
+from functools import lru_cache
+
+# orjson serializes message bodies several times faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add the parent directory to the Python path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load configuration from environment file
+# Load configuration from environment file (parsed once per process)
+@lru_cache(maxsize=1)
 def load_config():
     config = {}
     config_file = Path(".env")
@@ -22,8 +31,8 @@ def load_config():
         with open(config_file, 'r') as f:
             for line in f:
                 line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
+                if line and line[0] != '#' and '=' in line:
+                    key, _, value = line.partition('=')
                     key = key.replace('export ', '').strip()
                     value = value.strip().strip('"')
                     config[key] = value
@@ -32,6 +41,15 @@ def load_config():
 # Load configuration
 CONFIG = load_config()
 
+# s3://bucket/key - compiled once for validate_s3_path
+_S3_PATH_RE = re.compile(r'^s3://[a-zA-Z0-9._-]+/.*$', re.ASCII)
+
+# SQS SendMessageBatch accepts at most 10 entries per call
+SQS_BATCH_SIZE = 10
+
+# 1=highest, 5=lowest - shared by --priority and the jobs file
+PRIORITY_CHOICES = [1, 2, 3, 4, 5]
+
 # Now we can import from src if needed
 # For example, if you need to use the downloader:
 # from src.downloader import YouTubeDownloader
@@ -45,15 +63,19 @@ def parse_arguments():
     parser.add_argument(
         "--s3_input_path", "-i",
         type=str,
-        required=True,
         help="S3 path to audio file (e.g., s3://bucket/audio/file.mp3)"
     )
     parser.add_argument(
         "--s3_output_path", "-o",
         type=str,
-        required=True,
         help="S3 path for output transcript (e.g., s3://bucket/transcripts/file.json)"
     )
+    parser.add_argument(
+        "--jobs-file", "-f",
+        type=str,
+        help="JSONL file of jobs to send in batches, one object per line with "
+             "s3_input_path, s3_output_path and optional estimated_duration_seconds/priority"
+    )
     parser.add_argument(
         "--estimated_duration_seconds", "-d",
         type=int,
@@ -64,7 +86,7 @@ def parse_arguments():
         "--priority", "-p",
         type=int,
         default=1,
-        choices=[1, 2, 3, 4, 5],
+        choices=PRIORITY_CHOICES,
         help="Job priority (1=highest, 5=lowest, default: 1)"
     )
     parser.add_argument(
@@ -83,16 +105,118 @@ def parse_arguments():
 
 def validate_s3_path(s3_path):
     """Validate that the path is a valid S3 path"""
-    s3_pattern = r'^s3://[a-zA-Z0-9._-]+/.*$'
-    match = re.match(s3_pattern, s3_path)
-    if not match:
-        return False
-    return True
+    return _S3_PATH_RE.match(s3_path) is not None
+
+def to_json(obj):
+    """Serialize a message body to a JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def from_json(text):
+    """Parse one JSON document"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def build_message(s3_input_path, s3_output_path, estimated_duration_seconds, priority):
+    """Create a transcription job message body"""
+    return {
+        "job_id": str(uuid.uuid4()),
+        "s3_input_path": s3_input_path,
+        "s3_output_path": s3_output_path,
+        "estimated_duration_seconds": estimated_duration_seconds,
+        "priority": priority,
+        "retry_count": 0,
+        "submitted_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    }
+
+def load_jobs_file(jobs_file, default_duration, default_priority):
+    """Read and validate jobs from a JSONL file"""
+    messages = []
+    with open(jobs_file, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            job = from_json(line)
+            if not isinstance(job, dict):
+                raise ValueError(f"line {line_number}: expected a JSON object, got {type(job).__name__}")
+            
+            s3_input_path = job.get('s3_input_path', '')
+            s3_output_path = job.get('s3_output_path', '')
+            for s3_path in (s3_input_path, s3_output_path):
+                if not isinstance(s3_path, str) or not validate_s3_path(s3_path):
+                    raise ValueError(f"line {line_number}: '{s3_path}' is not a valid S3 path")
+            
+            try:
+                estimated_duration = int(job.get('estimated_duration_seconds', default_duration))
+                priority = int(job.get('priority', default_priority))
+            except (TypeError, ValueError):
+                raise ValueError(f"line {line_number}: estimated_duration_seconds and priority must be integers")
+            if priority not in PRIORITY_CHOICES:
+                raise ValueError(f"line {line_number}: priority {priority} is not one of 1-5")
+            
+            messages.append(build_message(
+                s3_input_path,
+                s3_output_path,
+                estimated_duration,
+                priority
+            ))
+    return messages
+
+def send_jobs_batch(sqs, queue_url, messages):
+    """Send job messages in SendMessageBatch calls of up to 10; returns the number that failed"""
+    failed = 0
+    for start in range(0, len(messages), SQS_BATCH_SIZE):
+        batch = messages[start:start + SQS_BATCH_SIZE]
+        response = sqs.send_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {'Id': str(i), 'MessageBody': to_json(message)}
+                for i, message in enumerate(batch)
+            ]
+        )
+        
+        for entry in response.get('Successful', []):
+            message = batch[int(entry['Id'])]
+            print(f"✅ {message['job_id']}: {message['s3_input_path']}")
+        for entry in response.get('Failed', []):
+            message = batch[int(entry['Id'])]
+            print(f"❌ {message['s3_input_path']}: {entry.get('Code')} {entry.get('Message', '')}")
+            failed += 1
+    return failed
 
 def main():
     """Main entry point"""
     args = parse_arguments()
     
+    if args.jobs_file:
+        try:
+            messages = load_jobs_file(args.jobs_file, args.estimated_duration_seconds, args.priority)
+        except (OSError, ValueError) as e:
+            print(f"Error reading jobs file: {e}")
+            sys.exit(1)
+        
+        if not messages:
+            print(f"Error: no jobs found in {args.jobs_file}")
+            sys.exit(1)
+        
+        try:
+            sqs = boto3.client('sqs', region_name=args.region)
+            failed = send_jobs_batch(sqs, args.queue_url, messages)
+        except Exception as e:
+            print(f"Error sending messages: {str(e)}")
+            sys.exit(1)
+        
+        print(f"Sent {len(messages) - failed}/{len(messages)} transcription jobs to {args.queue_url}")
+        sys.exit(1 if failed else 0)
+    
+    if not args.s3_input_path or not args.s3_output_path:
+        print("Error: --s3_input_path and --s3_output_path are required unless --jobs-file is given")
+        sys.exit(1)
+    
     # Validate S3 paths
     if not validate_s3_path(args.s3_input_path):
         print(f"Error: '{args.s3_input_path}' is not a valid S3 path")
@@ -107,17 +231,14 @@ def main():
         sqs = boto3.client('sqs', region_name=args.region)
         
         # Create message body with new structure
-        message = {
-            "job_id": str(uuid.uuid4()),
-            "s3_input_path": args.s3_input_path,
-            "s3_output_path": args.s3_output_path,
-            "estimated_duration_seconds": args.estimated_duration_seconds,
-            "priority": args.priority,
-            "retry_count": 0,
-            "submitted_at": datetime.utcnow().isoformat() + "Z"
-        }
-            
-        message_body = json.dumps(message)
+        message = build_message(
+            args.s3_input_path,
+            args.s3_output_path,
+            args.estimated_duration_seconds,
+            args.priority
+        )
+        
+        message_body = to_json(message)
         
         # Send message to SQS queue
         response = sqs.send_message(
@@ -42,6 +42,7 @@ S3_CODE_PATH="${S3_CODE_PREFIX}/${S3_CODE_VERSION}"
 declare -a CORE_FILES=(
     "src/transcription_worker.py"
     "src/queue_metrics.py"
+    "src/s3_utils.py"
     "src/transcriber.py"
 )
 
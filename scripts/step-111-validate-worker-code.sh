@@ -108,6 +108,7 @@ echo "🧪 Test 4: Verifying core worker files..."
 CORE_FILES=(
     "transcription_worker.py"
     "queue_metrics.py"
+    "s3_utils.py"
     "transcriber.py"
 )
 
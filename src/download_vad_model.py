@@ -7,16 +7,35 @@ This ensures the transcription worker can function even if the Docker build fail
 import os
 import boto3
 import logging
+import tempfile
+from boto3.s3.transfer import TransferConfig
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+MIN_VAD_MODEL_BYTES = 10000000  # > 10MB, anything smaller is a failed download
+
+def model_file_ok(model_path):
+    """True if the model file exists and is plausibly complete (single stat call)"""
+    try:
+        return model_path.stat().st_size > MIN_VAD_MODEL_BYTES
+    except FileNotFoundError:
+        return False
+
+# Fetch the ~17MB model as parallel ranged GETs instead of one stream
+VAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=4 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
 def download_vad_model_from_s3():
     """Download VAD model from S3 if not already present"""
     
     # Check if model already exists
     model_path = Path("/cache/torch/whisperx-vad-segmentation.bin")
-    if model_path.exists() and model_path.stat().st_size > 10000000:  # > 10MB
+    if model_file_ok(model_path):
         logger.info("✅ VAD model already exists locally")
         return True
     
@@ -26,16 +45,26 @@ def download_vad_model_from_s3():
         # Ensure directory exists
         model_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Download from S3 - using fixed bucket and path
+        # Download from S3 - using fixed bucket and path. Download next to the
+        # target and rename so a partial file is never left at model_path
         s3 = boto3.client('s3')
-        s3.download_file(
-            'dbm-cf-2-web',
-            'bintarball/whisperx-vad-segmentation.bin',
-            str(model_path)
-        )
+        fd, tmp_path = tempfile.mkstemp(dir=str(model_path.parent), suffix='.part')
+        os.close(fd)
+        try:
+            s3.download_file(
+                'dbm-cf-2-web',
+                'bintarball/whisperx-vad-segmentation.bin',
+                tmp_path,
+                Config=VAD_TRANSFER_CONFIG
+            )
+            os.replace(tmp_path, model_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
         
         # Verify download
-        if model_path.exists() and model_path.stat().st_size > 10000000:
+        if model_file_ok(model_path):
             logger.info("✅ VAD model downloaded successfully from S3")
             return True
         else:
@@ -6,6 +6,14 @@ This modifies the installed whisperx package to use our reliable S3 URL
 
 import os
 import re
+import shutil
+import tempfile
+
+# Our reliable copy of the VAD segmentation model
+NEW_VAD_URL = "https://s3.amazonaws.com/dbm-cf-2-web/bintarball/whisperx-vad-segmentation.bin"
+
+_VAD_URL_RE = re.compile(rb'VAD_SEGMENTATION_URL = "https://whisperx\.s3\.[^"]*"')
+_PATCHED_LINE = b'VAD_SEGMENTATION_URL = "' + NEW_VAD_URL.encode() + b'"'
 
 def patch_whisperx_vad():
     """Patch the whisperx vad.py file to use our S3 URL"""
@@ -18,24 +26,31 @@ def patch_whisperx_vad():
     
     try:
         # Read the current file
-        with open(vad_file, 'r') as f:
+        with open(vad_file, 'rb') as f:
             content = f.read()
         
-        # Update the URL to use our S3 bucket
-        new_url = "https://s3.amazonaws.com/dbm-cf-2-web/bintarball/whisperx-vad-segmentation.bin"
+        # Nothing to do if already patched (or no upstream URL to replace)
+        if _PATCHED_LINE in content:
+            print(f"✅ WhisperX VAD already uses S3 URL: {NEW_VAD_URL}")
+            return True
+        if not _VAD_URL_RE.search(content):
+            print("⚠️ WhisperX VAD URL not found - leaving vad.py unchanged")
+            return True
         
-        # Replace the URL
-        content = re.sub(
-            r'VAD_SEGMENTATION_URL = "https://whisperx\.s3\.[^"]*"',
-            f'VAD_SEGMENTATION_URL = "{new_url}"',
-            content
-        )
+        content = _VAD_URL_RE.sub(_PATCHED_LINE, content)
         
-        # Write back the modified content
-        with open(vad_file, 'w') as f:
-            f.write(content)
+        # Write to a temp file and swap it in so a crash can't leave vad.py half-written
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(vad_file), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            shutil.copymode(vad_file, tmp_path)
+            os.replace(tmp_path, vad_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         
-        print(f"✅ WhisperX VAD patched to use S3 URL: {new_url}")
+        print(f"✅ WhisperX VAD patched to use S3 URL: {NEW_VAD_URL}")
         return True
         
     except Exception as e:
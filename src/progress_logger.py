@@ -3,41 +3,124 @@
 Progress Logger - Writes detailed progress updates to S3 for monitoring
 """
 
-import json
-import boto3
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import os
 
+from s3_utils import get_s3_client, dumps
+
+# Coalesce updates so S3 sees at most one status/log write per interval
+FLUSH_INTERVAL_SECONDS = 2.0
+
+# Progress timestamps; the time functions used by every update() are bound
+# to module names once instead of being looked up on the time module each call
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_now = time.time
+_strftime = time.strftime
+_gmtime = time.gmtime
+
+# A repeat of the last status (same status/message/percentage/chunk) only
+# reaches S3 again once this long has passed, as a liveness refresh
+UNCHANGED_REWRITE_SECONDS = 5.0
+
+# Statuses that end a job - written synchronously so they are never lost
+TERMINAL_STATUSES = frozenset(("COMPLETED", "FAILED", "ERROR"))
+
+# One flusher thread serves every logger in the process; it checks for due
+# loggers each tick and hands their writes to a small shared pool
+FLUSH_TICK_SECONDS = 0.5
+FLUSH_WORKERS = 4
+
+_active_loggers = set()
+_active_lock = threading.Lock()
+_flush_wake = threading.Event()
+_flush_pool = None
+_put_pool = None
+_flusher_thread = None
+
+
+def _register_logger(progress_logger):
+    """Add a logger to the shared flusher, starting the flusher on first use"""
+    global _flush_pool, _put_pool, _flusher_thread
+    with _active_lock:
+        if _flusher_thread is None:
+            _flush_pool = ThreadPoolExecutor(max_workers=FLUSH_WORKERS, thread_name_prefix="progress-flush")
+            # Separate pool for the log PUTs a flush overlaps with its status PUT;
+            # sharing _flush_pool could deadlock with every worker waiting
+            _put_pool = ThreadPoolExecutor(max_workers=FLUSH_WORKERS * 2, thread_name_prefix="progress-put")
+            _flusher_thread = threading.Thread(target=_flush_loop, name="progress-flusher", daemon=True)
+            _flusher_thread.start()
+        _active_loggers.add(progress_logger)
+
+
+def _unregister_logger(progress_logger):
+    """Stop background flushing for a logger"""
+    with _active_lock:
+        _active_loggers.discard(progress_logger)
+
+
+def _flush_loop():
+    """Shared background thread: submit a flush for every logger whose interval has elapsed"""
+    while True:
+        _flush_wake.wait(FLUSH_TICK_SECONDS)
+        _flush_wake.clear()
+        now = time.time()
+        with _active_lock:
+            due = [l for l in _active_loggers if l._flush_due(now)]
+        for progress_logger in due:
+            progress_logger._in_flight = True
+            _flush_pool.submit(progress_logger._background_flush)
+
+
 class ProgressLogger:
     """Log progress updates to S3 for real-time monitoring"""
     
-    def __init__(self, s3_bucket, job_id, region="us-east-1"):
+    def __init__(self, s3_bucket, job_id, region="us-east-1", flush_interval=FLUSH_INTERVAL_SECONDS):
         self.s3_bucket = s3_bucket
         self.job_id = job_id
-        self.s3 = boto3.client('s3', region_name=region)
+        self.s3 = get_s3_client(region)
         self.progress_key = f"progress/{job_id}/status.json"
         self.log_key = f"progress/{job_id}/detailed_log.txt"
+        self.log_prefix = f"progress/{job_id}/log/"
         self.start_time = time.time()
-        self.logs = []
+        # UTF-8 log lines, appended in place rather than re-joined on every write
+        self._log_buf = bytearray()
+        self.flush_interval = flush_interval
         
+        # Latest state is kept in memory and written by the shared flusher
+        self._progress_data = None
+        self._pending = False
+        self._in_flight = False
+        self._last_state_hash = None
+        self._log_seq = 0
+        self._deltas_deleted = 0
+        self._logged_bytes = 0
+        self._state_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._last_flush = 0.0
+        _register_logger(self)
+    
     def update(self, status, message, percentage=None, chunk_info=None):
-        """Update progress status in S3"""
+        """Record a progress update; S3 is written at most every flush_interval seconds"""
         try:
-            elapsed = time.time() - self.start_time
-            timestamp = datetime.now().isoformat()
+            now = _now()
+            elapsed = now - self.start_time
+            timestamp = _strftime(ISO_UTC_FORMAT, _gmtime(now))
             
-            # Create progress update
+            # Create progress update - optional fields are left out rather than
+            # written as null, readers fall back to their own defaults
             progress_data = {
                 "job_id": self.job_id,
                 "status": status,
                 "message": message,
-                "percentage": percentage,
-                "elapsed_seconds": elapsed,
-                "timestamp": timestamp,
-                "last_update": timestamp
+                "elapsed_seconds": round(elapsed, 1),
+                "timestamp": timestamp
             }
             
+            if percentage is not None:
+                progress_data["percentage"] = percentage
             if chunk_info:
                 progress_data["chunk_info"] = chunk_info
             
@@ -48,29 +131,146 @@ class ProgressLogger:
             if chunk_info:
                 log_entry += f" - Chunk {chunk_info['current']}/{chunk_info['total']}"
             
-            self.logs.append(log_entry)
+            # Repeated heartbeats with nothing new only go to the in-memory log
+            state_hash = hash((status, message, percentage,
+                               tuple(sorted(chunk_info.items())) if chunk_info else None))
+            unchanged = (state_hash == self._last_state_hash
+                         and status not in TERMINAL_STATUSES
+                         and now - self._last_flush < UNCHANGED_REWRITE_SECONDS)
             
-            # Write progress JSON
-            self.s3.put_object(
-                Bucket=self.s3_bucket,
-                Key=self.progress_key,
-                Body=json.dumps(progress_data, indent=2),
-                ContentType="application/json"
-            )
-            
-            # Write detailed log
-            self.s3.put_object(
-                Bucket=self.s3_bucket,
-                Key=self.log_key,
-                Body="\n".join(self.logs),
-                ContentType="text/plain"
-            )
+            with self._state_lock:
+                self._log_buf += log_entry.encode('utf-8')
+                self._log_buf += b'\n'
+                self._last_state_hash = state_hash
+                if not unchanged:
+                    self._progress_data = progress_data
+                    self._pending = True
             
             print(log_entry)
             
+            # Nothing written recently - let the flusher pick this up now
+            # instead of on its next tick
+            if now - self._last_flush >= self.flush_interval:
+                _flush_wake.set()
+            
+            # Final states (and anything after close) go out immediately
+            if status in TERMINAL_STATUSES or self._closed:
+                self.close()
+        
         except Exception as e:
             print(f"Failed to update progress: {e}")
     
+    def _flush_due(self, now):
+        """True when there are unwritten updates and flush_interval has passed"""
+        return (self._pending and not self._in_flight
+                and now - self._last_flush >= self.flush_interval)
+    
+    def _background_flush(self):
+        """Flush run on the shared pool"""
+        try:
+            self.flush()
+        finally:
+            self._in_flight = False
+    
+    def flush(self):
+        """
+        Write the latest status JSON to S3 if anything changed
+        
+        Log lines added since the previous flush go to their own numbered object
+        under progress/{job_id}/log/, so each write is only the delta. While
+        the job runs detailed_log.txt does not exist - the log is only in those
+        delta objects. Once the logger is closed the full detailed_log.txt is
+        written and, when that succeeds, the deltas are deleted.
+        """
+        with self._flush_lock:
+            with self._state_lock:
+                if not self._pending:
+                    return
+                self._pending = False
+                progress_data = self._progress_data
+                new_lines = bytes(self._log_buf[self._logged_bytes:])
+                self._logged_bytes = len(self._log_buf)
+                full_log = bytes(self._log_buf) if self._closed else None
+            
+            # Log objects are written on the put pool while this thread writes
+            # the status JSON, so a flush costs one round-trip instead of two
+            log_writes = []
+            
+            # Append only the new log lines
+            if new_lines:
+                log_writes.append(_put_pool.submit(
+                    self.s3.put_object,
+                    Bucket=self.s3_bucket,
+                    Key=f"{self.log_prefix}{self._log_seq:08d}.txt",
+                    Body=new_lines,
+                    ContentType="text/plain"
+                ))
+                self._log_seq += 1
+            
+            # Write the complete detailed log once the job is finished
+            full_log_write = None
+            if full_log is not None:
+                full_log_write = _put_pool.submit(
+                    self.s3.put_object,
+                    Bucket=self.s3_bucket,
+                    Key=self.log_key,
+                    Body=full_log,
+                    ContentType="text/plain"
+                )
+                log_writes.append(full_log_write)
+            
+            try:
+                # Write progress JSON
+                self.s3.put_object(
+                    Bucket=self.s3_bucket,
+                    Key=self.progress_key,
+                    Body=dumps(progress_data),
+                    ContentType="application/json"
+                )
+            except Exception as e:
+                print(f"Failed to update progress: {e}")
+            
+            full_log_written = False
+            for future in log_writes:
+                try:
+                    future.result()
+                    if future is full_log_write:
+                        full_log_written = True
+                except Exception as e:
+                    print(f"Failed to update progress log: {e}")
+            
+            # The finished log now holds every line - remove the deltas
+            if full_log_written:
+                self._delete_log_deltas()
+            
+            self._last_flush = time.time()
+    
+    def _delete_log_deltas(self):
+        """Delete the numbered log objects written so far (DeleteObjects takes 1000 keys per call)"""
+        keys = [{"Key": f"{self.log_prefix}{seq:08d}.txt"}
+                for seq in range(self._deltas_deleted, self._log_seq)]
+        for start in range(0, len(keys), 1000):
+            try:
+                self.s3.delete_objects(
+                    Bucket=self.s3_bucket,
+                    Delete={"Objects": keys[start:start + 1000], "Quiet": True}
+                )
+            except Exception as e:
+                print(f"Failed to delete progress log deltas: {e}")
+                return
+        self._deltas_deleted = self._log_seq
+    
+    def close(self):
+        """Stop background flushing and synchronously write any pending update"""
+        if not self._closed:
+            self._closed = True
+            _unregister_logger(self)
+            # Always write once more so the full detailed log reaches S3
+            with self._state_lock:
+                if self._progress_data is not None:
+                    self._pending = True
+        self.flush()
+    
     def complete(self, success=True, result_data=None):
         """Mark job as complete"""
         status = "COMPLETED" if success else "FAILED"
@@ -81,5 +281,5 @@ class ProgressLogger:
             message += f" - {result_data.get('segments', 0)} segments generated"
         else:
             percentage = 0
-            
-        self.update(status, message, percentage)
\ No newline at end of file
+        
+        self.update(status, message, percentage)
@@ -5,18 +5,43 @@ Queue Metrics Manager - Lightweight duration tracking using S3 JSON file
 
 import json
 import logging
-import boto3
-from datetime import datetime
-from typing import Dict, Optional
+import random
+import time
+from typing import Dict, List, Optional, Tuple
 from botocore.exceptions import ClientError
 
+from s3_utils import get_s3_client, dumps, loads
+
 logger = logging.getLogger(__name__)
 
+# Conditional-write retries for update_stats when other workers race us
+UPDATE_STATS_ATTEMPTS = 5
+UPDATE_STATS_BACKOFF_SECONDS = 0.1
+
+# How long get_current_stats may serve the last read without asking S3
+STATS_CACHE_TTL_SECONDS = 2.0
+
+# last_updated format; the time functions are bound once rather than looked up
+# on the module for every stats write
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_strftime = time.strftime
+_gmtime = time.gmtime
+
+
+def _stats_metadata(stats: Dict) -> Dict[str, str]:
+    """Counters mirrored into x-amz-meta-* headers so readers can HEAD instead of GET"""
+    return {
+        "minutes": repr(float(stats['total_minutes_pending'])),
+        "jobs": str(int(stats['job_count'])),
+        "updated": stats.get('last_updated', '')
+    }
+
 
 class QueueMetricsManager:
     """Manages queue metrics in a lightweight S3 JSON file"""
     
-    def __init__(self, s3_bucket: str, metrics_key: str = "queue-stats.json", region: str = "us-east-1"):
+    def __init__(self, s3_bucket: str, metrics_key: str = "queue-stats.json", region: str = "us-east-1",
+                 cache_ttl: float = STATS_CACHE_TTL_SECONDS):
         """
         Initialize the queue metrics manager
         
@@ -24,40 +49,114 @@ class QueueMetricsManager:
             s3_bucket: S3 bucket for storing metrics
             metrics_key: S3 key for the metrics file
             region: AWS region
+            cache_ttl: Seconds get_current_stats may reuse the last read (0 disables)
         """
         self.s3_bucket = s3_bucket
         self.metrics_key = metrics_key
         self.region = region
-        self.s3 = boto3.client('s3', region_name=region)
+        self.s3 = get_s3_client(region)
+        self.cache_ttl = cache_ttl
+        # (fetched_at, stats, etag) from the last read or write
+        self._cache = (0.0, None, None)
         
-    def get_current_stats(self) -> Dict:
+    def _read_stats(self, use_cache: bool = False) -> Tuple[Dict, Optional[str]]:
         """
-        Get current queue statistics
+        Read queue statistics together with the object's ETag
         
+        Within cache_ttl of the last read a cached copy is returned when
+        use_cache is set. Otherwise the GET is conditional on the cached ETag,
+        so an unchanged file comes back as a bodiless 304 and is not re-parsed.
+        
+        Args:
+            use_cache: Allow a cached copy younger than cache_ttl
+            
         Returns:
-            Dict containing current stats, or default values if file doesn't exist
+            (stats, etag) - etag is None when the stats file doesn't exist yet
         """
+        fetched_at, cached_stats, cached_etag = self._cache
+        now = time.monotonic()
+        if use_cache and cached_stats is not None and now - fetched_at < self.cache_ttl:
+            return dict(cached_stats), cached_etag
+        
         try:
-            response = self.s3.get_object(Bucket=self.s3_bucket, Key=self.metrics_key)
-            data = json.loads(response['Body'].read().decode('utf-8'))
+            if cached_etag:
+                response = self.s3.get_object(Bucket=self.s3_bucket, Key=self.metrics_key,
+                                              IfNoneMatch=cached_etag)
+            else:
+                response = self.s3.get_object(Bucket=self.s3_bucket, Key=self.metrics_key)
+            data = loads(response['Body'].read())
             logger.info(f"Retrieved queue stats: {data}")
-            return data
+            self._cache = (now, data, response['ETag'])
+            return dict(data), response['ETag']
         except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
+            code = e.response['Error']['Code']
+            if code in ('304', 'NotModified'):
+                # Unchanged since the cached read - just extend its lifetime
+                self._cache = (now, cached_stats, cached_etag)
+                return dict(cached_stats), cached_etag
+            if code == 'NoSuchKey':
                 logger.info("Queue stats file doesn't exist, returning default values")
+                self._cache = (0.0, None, None)
                 return {
                     "total_minutes_pending": 0.0,
                     "job_count": 0,
-                    "last_updated": datetime.utcnow().isoformat() + "Z"
-                }
+                    "last_updated": _strftime(ISO_UTC_FORMAT, _gmtime())
+                }, None
             else:
                 logger.error(f"Error retrieving queue stats: {e}")
                 raise
     
+    def _read_counters(self) -> Dict:
+        """
+        Read only the pending minutes and job count
+        
+        The counters are mirrored into object metadata on every write, so this
+        is a HEAD request with no body to download or parse. Files without the
+        metadata (seeded by step-020 or written by an older worker) fall back
+        to reading the JSON body.
+        
+        Returns:
+            Dict with total_minutes_pending, job_count and last_updated
+        """
+        fetched_at, cached_stats, _ = self._cache
+        if cached_stats is not None and time.monotonic() - fetched_at < self.cache_ttl:
+            return dict(cached_stats)
+        
+        try:
+            response = self.s3.head_object(Bucket=self.s3_bucket, Key=self.metrics_key)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return self.get_current_stats()
+            logger.error(f"Error retrieving queue stats: {e}")
+            raise
+        
+        metadata = response.get('Metadata', {})
+        if 'minutes' not in metadata or 'jobs' not in metadata:
+            return self.get_current_stats()
+        
+        return {
+            "total_minutes_pending": float(metadata['minutes']),
+            "job_count": int(metadata['jobs']),
+            "last_updated": metadata.get('updated', '')
+        }
+    
+    def get_current_stats(self) -> Dict:
+        """
+        Get current queue statistics
+        
+        Returns:
+            Dict containing current stats, or default values if file doesn't exist
+        """
+        return self._read_stats(use_cache=True)[0]
+    
     def update_stats(self, minutes_delta: float = 0.0, job_count_delta: int = 0) -> Dict:
         """
         Update queue statistics atomically
         
+        The write is conditional on the ETag that was read (or on the file not
+        existing yet); if another writer got in first the stats are re-read and
+        the delta applied again, with jittered backoff between attempts.
+        
         Args:
             minutes_delta: Change in pending minutes (positive to add, negative to subtract)
             job_count_delta: Change in job count (positive to add, negative to subtract)
@@ -66,24 +165,39 @@ class QueueMetricsManager:
             Updated stats dictionary
         """
         try:
-            # Get current stats
-            current_stats = self.get_current_stats()
-            
-            # Update values
-            current_stats['total_minutes_pending'] = max(0.0, current_stats['total_minutes_pending'] + minutes_delta)
-            current_stats['job_count'] = max(0, current_stats['job_count'] + job_count_delta)
-            current_stats['last_updated'] = datetime.utcnow().isoformat() + "Z"
-            
-            # Write back to S3
-            self.s3.put_object(
-                Bucket=self.s3_bucket,
-                Key=self.metrics_key,
-                Body=json.dumps(current_stats, indent=2),
-                ContentType='application/json'
-            )
-            
-            logger.info(f"Updated queue stats: {current_stats}")
-            return current_stats
+            for attempt in range(UPDATE_STATS_ATTEMPTS):
+                # Get current stats
+                current_stats, etag = self._read_stats()
+                
+                # Update values
+                current_stats['total_minutes_pending'] = max(0.0, current_stats['total_minutes_pending'] + minutes_delta)
+                current_stats['job_count'] = max(0, current_stats['job_count'] + job_count_delta)
+                current_stats['last_updated'] = _strftime(ISO_UTC_FORMAT, _gmtime())
+                
+                condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+                
+                # Write back to S3
+                try:
+                    response = self.s3.put_object(
+                        Bucket=self.s3_bucket,
+                        Key=self.metrics_key,
+                        Body=dumps(current_stats),
+                        ContentType='application/json',
+                        Metadata=_stats_metadata(current_stats),
+                        **condition
+                    )
+                except ClientError as e:
+                    if e.response['Error']['Code'] not in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                        raise
+                    if attempt + 1 == UPDATE_STATS_ATTEMPTS:
+                        raise
+                    # Another writer updated the stats first - back off, re-read and retry
+                    time.sleep(random.uniform(0, UPDATE_STATS_BACKOFF_SECONDS * (2 ** attempt)))
+                    continue
+                
+                self._cache = (time.monotonic(), dict(current_stats), response['ETag'])
+                logger.info(f"Updated queue stats: {current_stats}")
+                return current_stats
             
         except Exception as e:
             logger.error(f"Error updating queue stats: {e}")
@@ -128,6 +242,45 @@ class QueueMetricsManager:
         minutes = estimated_duration_seconds / 60.0
         return self.update_stats(minutes_delta=-minutes, job_count_delta=-1)
     
+    def add_jobs(self, estimated_durations_seconds: List[int]) -> Dict:
+        """
+        Add several jobs to the queue metrics with a single stats update
+        
+        Args:
+            estimated_durations_seconds: Estimated duration of each job in seconds
+            
+        Returns:
+            Updated stats dictionary
+        """
+        minutes = sum(estimated_durations_seconds) / 60.0
+        return self.update_stats(minutes_delta=minutes, job_count_delta=len(estimated_durations_seconds))
+    
+    def complete_jobs(self, actual_durations_seconds: List[int]) -> Dict:
+        """
+        Mark several jobs as completed with a single stats update
+        
+        Args:
+            actual_durations_seconds: Actual duration of each completed job in seconds
+            
+        Returns:
+            Updated stats dictionary
+        """
+        minutes = sum(actual_durations_seconds) / 60.0
+        return self.update_stats(minutes_delta=-minutes, job_count_delta=-len(actual_durations_seconds))
+    
+    def remove_jobs(self, estimated_durations_seconds: List[int]) -> Dict:
+        """
+        Remove several failed/cancelled jobs with a single stats update
+        
+        Args:
+            estimated_durations_seconds: Estimated duration of each job in seconds
+            
+        Returns:
+            Updated stats dictionary
+        """
+        minutes = sum(estimated_durations_seconds) / 60.0
+        return self.update_stats(minutes_delta=-minutes, job_count_delta=-len(estimated_durations_seconds))
+    
     def get_pending_minutes(self) -> float:
         """
         Get the total pending minutes in the queue
@@ -135,7 +288,7 @@ class QueueMetricsManager:
         Returns:
             Total pending minutes
         """
-        stats = self.get_current_stats()
+        stats = self._read_counters()
         return stats['total_minutes_pending']
     
     def get_job_count(self) -> int:
@@ -145,7 +298,7 @@ class QueueMetricsManager:
         Returns:
             Total job count
         """
-        stats = self.get_current_stats()
+        stats = self._read_counters()
         return stats['job_count']
     
     def reset_stats(self) -> Dict:
@@ -158,15 +311,17 @@ class QueueMetricsManager:
         reset_stats = {
             "total_minutes_pending": 0.0,
             "job_count": 0,
-            "last_updated": datetime.utcnow().isoformat() + "Z"
+            "last_updated": _strftime(ISO_UTC_FORMAT, _gmtime())
         }
         
-        self.s3.put_object(
+        response = self.s3.put_object(
             Bucket=self.s3_bucket,
             Key=self.metrics_key,
-            Body=json.dumps(reset_stats, indent=2),
-            ContentType='application/json'
+            Body=dumps(reset_stats),
+            ContentType='application/json',
+            Metadata=_stats_metadata(reset_stats)
         )
+        self._cache = (time.monotonic(), dict(reset_stats), response['ETag'])
         
         logger.info("Queue stats reset to zero")
         return reset_stats
@@ -179,10 +334,10 @@ def main():
     parser = argparse.ArgumentParser(description="Queue Metrics Manager CLI")
     parser.add_argument("--bucket", required=True, help="S3 bucket name")
     parser.add_argument("--region", default="us-east-1", help="AWS region")
-    parser.add_argument("--action", choices=["get", "add", "complete", "reset"], 
+    parser.add_argument("--action", choices=["get", "add", "complete", "remove", "reset"], 
                        default="get", help="Action to perform")
-    parser.add_argument("--duration", type=int, default=300, 
-                       help="Duration in seconds (for add/complete actions)")
+    parser.add_argument("--duration", type=int, nargs="+", default=[300], 
+                       help="Duration in seconds, one per job (for add/complete/remove actions)")
     
     args = parser.parse_args()
     
@@ -197,12 +352,16 @@ def main():
         stats = manager.get_current_stats()
         print(json.dumps(stats, indent=2))
     elif args.action == "add":
-        stats = manager.add_job(args.duration)
-        print(f"Added job with {args.duration} seconds")
+        stats = manager.add_jobs(args.duration)
+        print(f"Added {len(args.duration)} job(s) with {sum(args.duration)} seconds")
         print(json.dumps(stats, indent=2))
     elif args.action == "complete":
-        stats = manager.complete_job(args.duration)
-        print(f"Completed job with {args.duration} seconds")
+        stats = manager.complete_jobs(args.duration)
+        print(f"Completed {len(args.duration)} job(s) with {sum(args.duration)} seconds")
+        print(json.dumps(stats, indent=2))
+    elif args.action == "remove":
+        stats = manager.remove_jobs(args.duration)
+        print(f"Removed {len(args.duration)} job(s) with {sum(args.duration)} seconds")
         print(json.dumps(stats, indent=2))
     elif args.action == "reset":
         stats = manager.reset_stats()
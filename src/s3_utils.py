@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+S3 Utilities - Shared S3 client and JSON helpers for worker modules
+"""
+
+import json
+import boto3
+from functools import lru_cache
+from botocore.config import Config
+
+# orjson serializes straight to bytes and parses bytes without decoding to str,
+# several times faster than stdlib json for the documents written on every update
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Shared by every S3 writer in the process; botocore's default pool of 10 is
+# too small once several threads write progress and metrics at the same time
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+
+@lru_cache(maxsize=8)
+def get_s3_client(region):
+    """Return the process-wide S3 client for a region (boto3 clients are thread-safe)"""
+    return boto3.client('s3', region_name=region, config=S3_CLIENT_CONFIG)
+
+
+def dumps(obj):
+    """Serialize a document to compact UTF-8 JSON bytes ready for put_object"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(body):
+    """Parse a JSON body straight from bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
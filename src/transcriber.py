@@ -8,14 +8,14 @@ import numpy as np
 import torch
 import whisperx
 from datetime import datetime
-import tempfile
 import boto3
-import soundfile as sf
-import subprocess
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# WhisperX models work on 16kHz mono audio
+SAMPLE_RATE = 16000
+
 class TranscriptionError(Exception):
     """Exception raised for errors during transcription"""
     pass
@@ -32,7 +32,8 @@ class Transcriber:
     """Handles audio transcription using WhisperX with chunking and progress tracking"""
 
     def __init__(self, model_name="large-v3", device="cuda", chunk_size=30,
-                 s3_bucket=None, region="us-east-1", batch_size=32, vad_onset=0.10, vad_offset=0.80):
+                 s3_bucket=None, region="us-east-1", batch_size=32, vad_onset=0.10, vad_offset=0.80,
+                 compute_type=None, compile_alignment=False):
         """
         Initialize the transcriber
         
@@ -45,6 +46,8 @@ class Transcriber:
             batch_size: Batch size for processing (32 optimal for GPU)
             vad_onset: Voice activity detection onset threshold (0-1)
             vad_offset: Voice activity detection offset threshold (0-1)
+            compute_type: CTranslate2 compute type (default: float16 on GPU, int8 on CPU)
+            compile_alignment: torch.compile the alignment model after loading
         """
         self.model_name = model_name
         # Determine actual device to use with detailed logging
@@ -66,6 +69,8 @@ class Transcriber:
         self.batch_size = batch_size
         self.vad_onset = vad_onset
         self.vad_offset = vad_offset
+        self.compute_type = compute_type
+        self.compile_alignment = compile_alignment
         self.model = None
 
         logger.info(f"🔧 TRANSCRIBER INIT: model={model_name}, device={self.device}, chunk_size={chunk_size}s")
@@ -78,8 +83,9 @@ class Transcriber:
         try:
             logger.info(f"🔧 MODEL LOADING: Starting WhisperX model {self.model_name} on {self.device}")
             
-            # Use float32 for CPU to avoid float16 computation issues
-            compute_type = "float32" if self.device == "cpu" else "float16"
+            # WhisperX runs on faster-whisper/CTranslate2 - its int8 kernels are the
+            # fast CPU path (CPUs have no float16 support), float16 on GPU
+            compute_type = self.compute_type or ("int8" if self.device == "cpu" else "float16")
             logger.info(f"🔧 COMPUTE TYPE: Selected {compute_type} for device {self.device}")
             logger.info(f"🔧 TORCH CUDA: Available={torch.cuda.is_available()}, Device Count={torch.cuda.device_count() if torch.cuda.is_available() else 0}")
             
@@ -92,6 +98,8 @@ class Transcriber:
                 language_code="en",
                 device=self.device
             )
+            if self.compile_alignment:
+                self._compile_alignment_model()
 
             logger.info("✅ ALL MODELS LOADED: WhisperX and alignment models ready for transcription")
         except Exception as e:
@@ -99,112 +107,141 @@ class Transcriber:
             logger.error(error_msg)
             raise ModelLoadError(error_msg)
 
-    def convert_webm_to_wav(self, input_file):
+    def _compile_alignment_model(self):
+        """
+        Compile the alignment model with torch.compile and warm it up
+        
+        Only the wav2vec2 alignment model is a torch module - transcription runs
+        inside CTranslate2, which torch.compile cannot reach. Alignment sees a
+        different segment length on almost every call, so the model is compiled
+        with dynamic shapes in default mode; CUDA graph capture
+        ("reduce-overhead") would record and keep a graph per length.
+        Falls back to the eager model if compilation is unavailable or fails.
+        """
+        if not hasattr(torch, "compile"):
+            logger.info("⚠️ torch.compile not available, using eager alignment model")
+            return
+
+        try:
+            logger.info("🔧 ALIGNMENT MODEL: Compiling with torch.compile (dynamic shapes)")
+            compiled = torch.compile(self.alignment_model, dynamic=True)
+
+            # Compilation happens on the first call - do it now on a silent
+            # clip rather than during the first job
+            warmup = torch.zeros(1, self.chunk_size * SAMPLE_RATE, device=self.device)
+            with torch.inference_mode():
+                compiled(warmup)
+
+            self.alignment_model = compiled
+            logger.info("✅ ALIGNMENT MODEL: Compiled and warmed up")
+        except Exception as e:
+            logger.warning(f"⚠️ torch.compile failed, using eager alignment model: {str(e)}")
+
+    def load_audio_array(self, audio_file):
         """
-        Convert webm file to wav format using ffmpeg
+        Decode an audio file into the array WhisperX works on
+        
+        whisperx.load_audio pipes ffmpeg's raw 16-bit PCM output straight into
+        numpy, so any container ffmpeg understands (webm included) is decoded
+        without an intermediate WAV on disk.
         
         Args:
-            input_file: Path to webm file
+            audio_file: Path to audio file
             
         Returns:
-            Path to converted wav file
+            float32 16kHz mono samples
         """
         try:
-            # Create temporary wav file
-            input_path = Path(input_file)
-            wav_file = input_path.with_suffix('.wav')
-            
-            logger.info(f"🎥 FFMPEG CONVERSION: {input_file} → {wav_file}")
-            
-            # Use ffmpeg to convert webm to wav
-            cmd = [
-                'ffmpeg', '-i', input_file,
-                '-acodec', 'pcm_s16le',  # 16-bit PCM
-                '-ar', '16000',          # 16kHz sample rate for Whisper
-                '-ac', '1',              # Mono
-                '-y',                    # Overwrite output file
-                str(wav_file)
-            ]
-            
-            logger.info(f"🔧 FFMPEG COMMAND: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            logger.info(f"✅ FFMPEG SUCCESS: Converted to {wav_file}")
-            logger.info(f"📊 FFMPEG OUTPUT: {result.stderr[-200:] if result.stderr else 'No stderr'}")
-            return str(wav_file)
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = f"FFmpeg conversion failed: {e.stderr}"
-            logger.error(error_msg)
-            raise AudioProcessingError(error_msg)
+            logger.info(f"Loading audio file: {audio_file}")
+            audio_data = whisperx.load_audio(audio_file)
+            logger.info(f"Decoded {len(audio_data) / SAMPLE_RATE:.1f}s of audio")
+            return audio_data
+
         except Exception as e:
-            error_msg = f"Error converting webm file: {str(e)}"
+            error_msg = f"Error loading audio: {str(e)}"
             logger.error(error_msg)
             raise AudioProcessingError(error_msg)
 
-    def segment_audio(self, audio_file, output_dir):
+    def segment_audio(self, audio_file):
         """
-        Split audio file into chunks for processing
+        Decode audio once and split it into chunks for processing
         
         Args:
             audio_file: Path to audio file
-            output_dir: Directory to save chunks
             
         Returns:
-            List of chunk file paths
+            List of float32 16kHz mono sample arrays - views into a single
+            decoded buffer, passed straight to WhisperX without temp files
         """
-        try:
-            os.makedirs(output_dir, exist_ok=True)
-
-            # Check if we need to convert webm to wav
-            audio_path = audio_file
-            if audio_file.lower().endswith('.webm'):
-                logger.info(f"🎬 WEBM DETECTED: {audio_file}")
-                logger.info(f"🔄 Converting webm to wav format...")
-                audio_path = self.convert_webm_to_wav(audio_file)
-                logger.info(f"✅ WEBM CONVERSION COMPLETE: {audio_path}")
-
-            # Load audio file
-            logger.info(f"Loading audio file: {audio_path}")
-            audio_data, sample_rate = sf.read(audio_path)
-
-            # Calculate chunk size in samples
-            chunk_samples = int(self.chunk_size * sample_rate)
-            total_samples = len(audio_data)
-
-            # Create chunks
-            chunk_files = []
-            for i, start_idx in enumerate(range(0, total_samples, chunk_samples)):
-                end_idx = min(start_idx + chunk_samples, total_samples)
-                chunk_data = audio_data[start_idx:end_idx]
-
-                # Save chunk
-                chunk_file = os.path.join(output_dir, f"chunk_{i:04d}.wav")
-                sf.write(chunk_file, chunk_data, sample_rate)
-                chunk_files.append(chunk_file)
-
-            logger.info(f"Created {len(chunk_files)} audio chunks")
-            
-            # Clean up converted wav file if we created one
-            if audio_path != audio_file and os.path.exists(audio_path):
-                logger.info(f"Cleaning up converted file: {audio_path}")
-                os.remove(audio_path)
-            
-            return chunk_files
+        audio_data = self.load_audio_array(audio_file)
 
-        except Exception as e:
-            # Clean up converted wav file if we created one
-            if 'audio_path' in locals() and audio_path != audio_file and os.path.exists(audio_path):
-                logger.info(f"Cleaning up converted file after error: {audio_path}")
-                os.remove(audio_path)
+        # Calculate chunk size in samples
+        chunk_samples = int(self.chunk_size * SAMPLE_RATE)
+
+        # Create chunks - slicing shares the decoded buffer, nothing is copied
+        chunks = [
+            audio_data[start_idx:start_idx + chunk_samples]
+            for start_idx in range(0, len(audio_data), chunk_samples)
+        ]
+
+        logger.info(f"Created {len(chunks)} audio chunks")
+        return chunks
+
+    def _transcribe_array(self, audio, language):
+        """
+        Run WhisperX on an audio array and align the result
+        
+        Args:
+            audio: float32 16kHz mono samples
+            language: Language code
             
-            error_msg = f"Error segmenting audio: {str(e)}"
-            logger.error(error_msg)
-            raise AudioProcessingError(error_msg)
+        Returns:
+            Aligned result with word-level timestamps relative to the array start
+        """
+        vad_options = {
+            "vad_onset": self.vad_onset,
+            "vad_offset": self.vad_offset,
+        }
+
+        try:
+            # Try with vad_options first (newer WhisperX versions)
+            result = self.model.transcribe(
+                audio,
+                batch_size=self.batch_size,
+                language=language,
+                vad_options=vad_options
+            )
+        except TypeError as e:
+            if "vad_options" in str(e):
+                logger.info("⚠️ VAD options not supported, using basic transcription")
+                # Fallback for older WhisperX versions
+                result = self.model.transcribe(
+                    audio,
+                    batch_size=self.batch_size,
+                    language=language
+                )
+            else:
+                raise
+
+        # Align words for precise timestamps
+        return whisperx.align(
+            result["segments"],
+            self.alignment_model,
+            self.metadata,
+            audio,
+            device=self.device
+        )
 
     def transcribe_audio(self, audio_file, job_id=None, job_tracker=None, video_id=None, language="en"):
         """
         Transcribe audio file with progress tracking
         
+        With a video_id the file is transcribed chunk by chunk and each chunk is
+        checkpointed to S3, so a failed job can continue via resume_transcription.
+        Without one the whole file goes through a single batched WhisperX call,
+        which is faster but reports no intermediate progress and restarts from
+        scratch if it fails.
+        
         Args:
             audio_file: Path to audio file
             job_id: Job ID for tracking
@@ -219,105 +256,52 @@ class Transcriber:
             # Ensure model is loaded
             self.load_model()
 
-            # Create temporary directory for chunks
-            with tempfile.TemporaryDirectory() as temp_dir:
-                logger.info(f"Created temporary directory: {temp_dir}")
+            if video_id:
+                # Resumable job - transcribe chunk by chunk so every chunk is
+                # checkpointed and progress advances per chunk
+                chunks = self.segment_audio(audio_file)
 
-                # Segment audio
-                chunk_files = self.segment_audio(audio_file, temp_dir)
+                if job_tracker and job_id:
+                    job_tracker.update_progress(job_id, total_chunks=len(chunks), completed_chunks=0)
+
+                all_segments = self._transcribe_chunks(chunks, video_id, language, job_id, job_tracker)
+            else:
+                # Decode once and transcribe the whole file in a single call - WhisperX's
+                # VAD cuts it into segments that are batched through the model
+                # together, and timestamps come back relative to the file start.
+                # Nothing is checkpointed, so progress only moves from 0 to 1 of 1
+                audio = self.load_audio_array(audio_file)
 
                 if job_tracker and job_id:
-                    job_tracker.update_progress(job_id, total_chunks=len(chunk_files), completed_chunks=0)
-
-                # Process each chunk
-                all_segments = []
-
-                # This is to be passed to the self.model.transcribe as in 
-                # something like:   result = self.model.transcribe(audio, vad_options=vad_options)
-                vad_options = {
-                    "vad_onset": self.vad_onset,
-                    "vad_offset": self.vad_offset,
-                }
-
-                for i, chunk_file in enumerate(chunk_files):
-                    logger.info(f"Processing chunk {i+1}/{len(chunk_files)}")
-
-                    # Transcribe chunk
-                    try:
-                        # Try with vad_options first (newer WhisperX versions)
-                        result = self.model.transcribe(
-                            chunk_file,
-                            batch_size=self.batch_size,
-                            language=language,
-                            vad_options=vad_options
-                        )
-                    except TypeError as e:
-                        if "vad_options" in str(e):
-                            logger.info("⚠️ VAD options not supported, using basic transcription")
-                            # Fallback for older WhisperX versions
-                            result = self.model.transcribe(
-                                chunk_file,
-                                batch_size=self.batch_size,
-                                language=language
-                            )
-                        else:
-                            raise
-
-                    # Align words for precise timestamps
-                    result = whisperx.align(
-                        result["segments"],
-                        self.alignment_model,
-                        self.metadata,
-                        chunk_file,
-                        device=self.device
-                    )
+                    job_tracker.update_progress(job_id, total_chunks=1, completed_chunks=0)
 
-                    # Adjust timestamps for chunk position
-                    chunk_start_time = i * self.chunk_size
-                    for segment in result["segments"]:
-                        segment["start"] += chunk_start_time
-                        segment["end"] += chunk_start_time
-
-                        for word in segment["words"]:
-                            word["start"] += chunk_start_time
-                            word["end"] += chunk_start_time
-
-                    # Add to results
-                    all_segments.extend(result["segments"])
-
-                    # Save progress to S3 if needed
-                    if self.s3_bucket and video_id:
-                        segment_key = f"transcripts/{video_id}/segments/chunk_{i:04d}.json"
-                        self.s3.put_object(
-                            Body=json.dumps(result["segments"]),
-                            Bucket=self.s3_bucket,
-                            Key=segment_key,
-                            ContentType="application/json"
-                        )
-
-                    # Update progress
-                    if job_tracker and job_id:
-                        job_tracker.update_progress(job_id, completed_chunks=i+1)
-
-                # Combine results
-                final_result = {
-                    "segments": sorted(all_segments, key=lambda x: x["start"]),
-                    "language": language,
-                    "video_id": video_id,
-                    "transcribed_at": datetime.now().isoformat()
-                }
-
-                # Save complete transcript
-                if self.s3_bucket and video_id:
-                    transcript_key = f"transcripts/{video_id}/full_transcript.json"
-                    self.s3.put_object(
-                        Body=json.dumps(final_result),
-                        Bucket=self.s3_bucket,
-                        Key=transcript_key,
-                        ContentType="application/json"
-                    )
+                logger.info(f"Transcribing full audio with batch_size={self.batch_size}")
+                result = self._transcribe_array(audio, language)
+                all_segments = result["segments"]
 
-                return final_result
+                # Update progress
+                if job_tracker and job_id:
+                    job_tracker.update_progress(job_id, completed_chunks=1)
+
+            # Combine results
+            final_result = {
+                "segments": sorted(all_segments, key=lambda x: x["start"]),
+                "language": language,
+                "video_id": video_id,
+                "transcribed_at": datetime.now().isoformat()
+            }
+
+            # Save complete transcript
+            if self.s3_bucket and video_id:
+                transcript_key = f"transcripts/{video_id}/full_transcript.json"
+                self.s3.put_object(
+                    Body=json.dumps(final_result),
+                    Bucket=self.s3_bucket,
+                    Key=transcript_key,
+                    ContentType="application/json"
+                )
+
+            return final_result
 
         except Exception as e:
             error_msg = f"Error transcribing audio: {str(e)}"
@@ -411,6 +395,90 @@ class Transcriber:
             logger.error(f"Error listing completed segments: {str(e)}")
             return []
 
+    def _put_json(self, key, data):
+        """Write a JSON document to the transcripts bucket"""
+        self.s3.put_object(
+            Body=json.dumps(data),
+            Bucket=self.s3_bucket,
+            Key=key,
+            ContentType="application/json"
+        )
+
+    def _transcribe_chunks(self, chunks, video_id, language, job_id=None, job_tracker=None,
+                           completed_segments=()):
+        """
+        Transcribe chunks one at a time, checkpointing each to S3
+        
+        Each chunk's segments are written to transcripts/{video_id}/segments/
+        so resume_transcription can pick up after a failure.
+        
+        Args:
+            chunks: Audio arrays from segment_audio
+            video_id: YouTube video ID
+            language: Language code
+            job_id: Job ID for tracking
+            job_tracker: JobTracker instance for progress updates
+            completed_segments: Chunk indices already checkpointed, skipped here
+            
+        Returns:
+            Segments of the transcribed chunks, timestamps relative to the file start
+        """
+        all_segments = []
+
+        # Chunk checkpoints are uploaded on a background thread so the GPU
+        # starts the next chunk instead of waiting on S3; one worker keeps
+        # them in chunk order
+        pending_uploads = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="segment-upload") as uploader:
+            # Process remaining chunks
+            for i, chunk_audio in enumerate(chunks):
+                if i in completed_segments:
+                    logger.info(f"Skipping already processed chunk {i}")
+                    continue
+
+                # Fail fast on a checkpoint that didn't reach S3 rather than
+                # finding out after the rest of the GPU work is done
+                while pending_uploads and pending_uploads[0].done():
+                    pending_uploads.pop(0).result()
+
+                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+
+                # Transcribe and align chunk
+                result = self._transcribe_array(chunk_audio, language)
+
+                # Adjust timestamps for chunk position
+                chunk_start_time = i * self.chunk_size
+                for segment in result["segments"]:
+                    segment["start"] += chunk_start_time
+                    segment["end"] += chunk_start_time
+
+                    for word in segment["words"]:
+                        word["start"] += chunk_start_time
+                        word["end"] += chunk_start_time
+
+                # Add to results
+                all_segments.extend(result["segments"])
+
+                # Save progress to S3
+                if self.s3_bucket:
+                    segment_key = f"transcripts/{video_id}/segments/chunk_{i:04d}.json"
+                    pending_uploads.append(uploader.submit(
+                        self._put_json, segment_key, result["segments"]
+                    ))
+
+                # Update progress
+                if job_tracker and job_id:
+                    job_tracker.update_progress(
+                        job_id,
+                        completed_chunks=len(completed_segments) + i + 1
+                    )
+
+            # Every checkpoint must be in S3 before the full transcript is written
+            for upload in pending_uploads:
+                upload.result()
+
+        return all_segments
+
     def resume_transcription(self, audio_file, job_id, job_tracker, video_id, language="en"):
         """
         Resume transcription from where it left off
@@ -440,117 +508,40 @@ class Transcriber:
             # Ensure model is loaded
             self.load_model()
 
-            # Create temporary directory for chunks
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Segment audio
-                chunk_files = self.segment_audio(audio_file, temp_dir)
-
-                if job_tracker:
-                    job_tracker.update_progress(job_id, total_chunks=len(chunk_files),
-                                             completed_chunks=len(completed_segments))
-
-                # Process each chunk that hasn't been completed
-                all_segments = []
-
-                # First load all completed segments
-                for idx in completed_segments:
-                    segment_data = self.load_segment_from_s3(video_id, idx)
-                    if segment_data:
-                        all_segments.extend(segment_data)
-
-                # Define VAD options for resume transcription
-                vad_options = {
-                    "vad_onset": self.vad_onset,
-                    "vad_offset": self.vad_offset,
-                }
-
-                # Process remaining chunks
-                for i, chunk_file in enumerate(chunk_files):
-                    if i in completed_segments:
-                        logger.info(f"Skipping already processed chunk {i}")
-                        continue
-
-                    logger.info(f"Processing chunk {i+1}/{len(chunk_files)}")
-
-                    # Transcribe chunk
-                    try:
-                        # Try with vad_options first (newer WhisperX versions)
-                        result = self.model.transcribe(
-                            chunk_file,
-                            batch_size=self.batch_size,
-                            language=language,
-                            vad_options=vad_options
-                        )
-                    except TypeError as e:
-                        if "vad_options" in str(e):
-                            logger.info("⚠️ VAD options not supported, using basic transcription")
-                            # Fallback for older WhisperX versions
-                            result = self.model.transcribe(
-                                chunk_file,
-                                batch_size=self.batch_size,
-                                language=language
-                            )
-                        else:
-                            raise
-
-                    # Align words for precise timestamps
-                    result = whisperx.align(
-                        result["segments"],
-                        self.alignment_model,
-                        self.metadata,
-                        chunk_file,
-                        device=self.device
-                    )
+            # Segment audio
+            chunks = self.segment_audio(audio_file)
 
-                    # Adjust timestamps for chunk position
-                    chunk_start_time = i * self.chunk_size
-                    for segment in result["segments"]:
-                        segment["start"] += chunk_start_time
-                        segment["end"] += chunk_start_time
-
-                        for word in segment["words"]:
-                            word["start"] += chunk_start_time
-                            word["end"] += chunk_start_time
-
-                    # Add to results
-                    all_segments.extend(result["segments"])
-
-                    # Save progress to S3
-                    if self.s3_bucket:
-                        segment_key = f"transcripts/{video_id}/segments/chunk_{i:04d}.json"
-                        self.s3.put_object(
-                            Body=json.dumps(result["segments"]),
-                            Bucket=self.s3_bucket,
-                            Key=segment_key,
-                            ContentType="application/json"
-                        )
-
-                    # Update progress
-                    if job_tracker:
-                        job_tracker.update_progress(
-                            job_id,
-                            completed_chunks=len(completed_segments) + i + 1
-                        )
-
-                # Combine results
-                final_result = {
-                    "segments": sorted(all_segments, key=lambda x: x["start"]),
-                    "language": language,
-                    "video_id": video_id,
-                    "transcribed_at": datetime.now().isoformat()
-                }
-
-                # Save complete transcript
-                if self.s3_bucket:
-                    transcript_key = f"transcripts/{video_id}/full_transcript.json"
-                    self.s3.put_object(
-                        Body=json.dumps(final_result),
-                        Bucket=self.s3_bucket,
-                        Key=transcript_key,
-                        ContentType="application/json"
-                    )
+            if job_tracker:
+                job_tracker.update_progress(job_id, total_chunks=len(chunks),
+                                         completed_chunks=len(completed_segments))
+
+            # Process each chunk that hasn't been completed
+            all_segments = []
+
+            # First load all completed segments
+            for idx in completed_segments:
+                segment_data = self.load_segment_from_s3(video_id, idx)
+                if segment_data:
+                    all_segments.extend(segment_data)
+
+            all_segments.extend(self._transcribe_chunks(
+                chunks, video_id, language, job_id, job_tracker, completed_segments
+            ))
+
+            # Combine results
+            final_result = {
+                "segments": sorted(all_segments, key=lambda x: x["start"]),
+                "language": language,
+                "video_id": video_id,
+                "transcribed_at": datetime.now().isoformat()
+            }
+
+            # Save complete transcript
+            if self.s3_bucket:
+                transcript_key = f"transcripts/{video_id}/full_transcript.json"
+                self._put_json(transcript_key, final_result)
 
-                return final_result
+            return final_result
 
         except Exception as e:
             error_msg = f"Error resuming transcription: {str(e)}"
@@ -60,7 +60,8 @@ class TranscriptionWorker:
                  temp_dir: str = "/tmp",
                  idle_threshold_minutes: int = 60,
                  use_gpu: bool = True,
-                 model_name: str = "large-v3"):
+                 model_name: str = "large-v3",
+                 compile_alignment: bool = False):
         """
         Initialize the transcription worker
         
@@ -72,6 +73,7 @@ class TranscriptionWorker:
             idle_threshold_minutes: Minutes to wait before shutting down when idle
             use_gpu: Whether to use GPU for transcription
             model_name: Whisper model to use
+            compile_alignment: torch.compile the alignment model (standard transcriber only)
         """
         self.queue_url = queue_url
         self.s3_bucket = s3_bucket
@@ -124,7 +126,8 @@ class TranscriptionWorker:
                 device=device,
                 chunk_size=30,
                 s3_bucket=s3_bucket,
-                region=region
+                region=region,
+                compile_alignment=compile_alignment
             )
         
         # Ensure temp directory exists
@@ -410,6 +413,8 @@ def main():
     parser.add_argument("--idle-timeout", type=int, default=5, help="Idle timeout in minutes")
     parser.add_argument("--model", default="large-v3", help="Whisper model to use")
     parser.add_argument("--cpu-only", action="store_true", help="Use CPU only (no GPU)")
+    parser.add_argument("--compile-alignment", action="store_true",
+                        help="torch.compile the alignment model (standard transcriber only)")
     
     args = parser.parse_args()
     
@@ -421,7 +426,8 @@ def main():
         temp_dir=args.temp_dir,
         idle_threshold_minutes=args.idle_timeout,
         use_gpu=not args.cpu_only,
-        model_name=args.model
+        model_name=args.model,
+        compile_alignment=args.compile_alignment
     )
     
     worker.run()
@@ -40,12 +40,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rollup of every worker's heartbeat so monitors can read one object
+WORKER_INDEX_KEY = "workers/_index.json"
+WORKER_INDEX_WRITE_ATTEMPTS = 3
+WORKER_INDEX_STOPPED_TTL_HOURS = 24
+# Monitors treat a heartbeat older than 5 minutes as stale
+WORKER_INDEX_INTERVAL_SECONDS = 60
+
 class EnhancedTranscriptionWorker:
     """Enhanced worker with detailed progress tracking"""
     
     def __init__(self, queue_url, s3_bucket, region='us-east-1', 
                  model_name='large-v3', device='cuda', idle_timeout_minutes=60,
-                 temp_dir='/tmp'):
+                 temp_dir='/tmp', compile_alignment=False):
         self.queue_url = queue_url
         self.s3_bucket = s3_bucket
         self.region = region
@@ -85,13 +92,15 @@ class EnhancedTranscriptionWorker:
                 device=device,
                 chunk_size=30,
                 s3_bucket=s3_bucket,
-                region=region
+                region=region,
+                compile_alignment=compile_alignment
             )
         
         # Worker state
         self.idle_start = None
         self.shutdown_requested = False
         self.jobs_processed = 0
+        self.last_index_update = 0.0
         
         # Set up signal handlers
         self.setup_signal_handlers()
@@ -107,6 +116,7 @@ class EnhancedTranscriptionWorker:
     
     def process_job_with_progress(self, message: dict) -> bool:
         """Process job with detailed progress tracking"""
+        progress = None
         try:
             # Parse message
             body = json.loads(message['Body'])
@@ -205,7 +215,15 @@ class EnhancedTranscriptionWorker:
                 
         except Exception as e:
             logger.error(f"Fatal error in job processing: {e}")
+            if progress is not None:
+                progress.update("ERROR", f"Job failed: {str(e)}", 0)
             return False
+        
+        finally:
+            # Unregister from the shared flusher and write detailed_log.txt on
+            # every exit path, not only those that reached a terminal status
+            if progress is not None:
+                progress.close()
     
     def download_audio_from_s3(self, s3_path: str) -> str:
         """Download audio file from S3"""
@@ -231,6 +249,90 @@ class EnhancedTranscriptionWorker:
         logger.info(f"Uploading transcript to {s3_path}")
         self.s3.upload_file(local_path, bucket, key)
     
+    def update_worker_index(self, worker_status: dict, force: bool = False):
+        """
+        Merge this worker's status into the workers/_index.json rollup
+        
+        Runs at most once per WORKER_INDEX_INTERVAL_SECONDS unless forced, so
+        the shared GET+PUT doesn't precede every long-poll. Best effort - any
+        failure is logged and repaired by a later heartbeat, it never stops
+        the worker from taking jobs.
+        """
+        now = time.time()
+        if not force and now - self.last_index_update < WORKER_INDEX_INTERVAL_SECONDS:
+            return
+        self.last_index_update = now
+        
+        try:
+            self._write_worker_index(worker_status)
+        except Exception as e:
+            logger.warning(f"Could not update worker index: {e}")
+    
+    def _write_worker_index(self, worker_status: dict):
+        """
+        Read-merge-write the worker index
+        
+        Writes are conditional on the ETag that was read (or on the object not
+        existing yet), so a concurrent heartbeat from another worker is retried
+        rather than overwritten. An unreadable index, or unreadable entries in
+        it, are replaced instead of failing the merge.
+        """
+        for attempt in range(WORKER_INDEX_WRITE_ATTEMPTS):
+            try:
+                try:
+                    response = self.s3.get_object(Bucket=self.s3_bucket, Key=WORKER_INDEX_KEY)
+                    condition = {"IfMatch": response['ETag']}
+                    try:
+                        index = json.loads(response['Body'].read().decode('utf-8'))
+                    except ValueError as e:
+                        logger.warning(f"Worker index is not valid JSON, rebuilding it: {e}")
+                        index = {}
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'NoSuchKey':
+                        raise
+                    index = {}
+                    condition = {"IfNoneMatch": "*"}
+                
+                if not isinstance(index, dict):
+                    index = {}
+                workers = index.get("workers")
+                if not isinstance(workers, dict):
+                    workers = {}
+                workers[self.worker_id] = dict(worker_status)
+                
+                # Drop workers that stopped long ago so the rollup stays small,
+                # along with entries too malformed to age
+                cutoff = time.time() - WORKER_INDEX_STOPPED_TTL_HOURS * 3600
+                for worker_id, status in list(workers.items()):
+                    try:
+                        stopped_at = status.get("stopped_at")
+                        if status.get("status") == "STOPPED" and stopped_at:
+                            stopped_ts = datetime.fromisoformat(stopped_at.replace('Z', '+00:00')).timestamp()
+                            if stopped_ts < cutoff:
+                                del workers[worker_id]
+                    except (AttributeError, TypeError, ValueError):
+                        logger.warning(f"Dropping unreadable worker index entry for {worker_id}")
+                        del workers[worker_id]
+                
+                index["workers"] = workers
+                index["updated_at"] = datetime.utcnow().isoformat() + "Z"
+                
+                self.s3.put_object(
+                    Bucket=self.s3_bucket,
+                    Key=WORKER_INDEX_KEY,
+                    Body=json.dumps(index),
+                    ContentType="application/json",
+                    **condition
+                )
+                return
+            
+            except ClientError as e:
+                if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    continue  # Another worker wrote first - re-read and merge again
+                raise
+        
+        logger.warning("Worker index update lost to concurrent writers, retrying on next heartbeat")
+    
     def should_continue_running(self) -> bool:
         """Check if worker should continue running"""
         if self.shutdown_requested:
@@ -296,6 +398,7 @@ class EnhancedTranscriptionWorker:
                     Body=json.dumps(worker_status),
                     ContentType="application/json"
                 )
+                self.update_worker_index(worker_status)
                 
                 # Poll for messages
                 response = self.sqs.receive_message(
@@ -332,6 +435,7 @@ class EnhancedTranscriptionWorker:
             Body=json.dumps(worker_status),
             ContentType="application/json"
         )
+        self.update_worker_index(worker_status, force=True)
         
         logger.info("Worker shutting down gracefully")
 
@@ -344,6 +448,8 @@ def main():
     parser.add_argument('--model', default='large-v3', help='Whisper model to use')
     parser.add_argument('--cpu-only', action='store_true', help='Use CPU instead of GPU')
     parser.add_argument('--idle-timeout', type=int, default=60, help='Idle timeout in minutes')
+    parser.add_argument('--compile-alignment', action='store_true',
+                        help='torch.compile the alignment model (standard transcriber only)')
     
     args = parser.parse_args()
     
@@ -355,7 +461,8 @@ def main():
         region=args.region,
         model_name=args.model,
         device=device,
-        idle_timeout_minutes=args.idle_timeout
+        idle_timeout_minutes=args.idle_timeout,
+        compile_alignment=args.compile_alignment
     )
     
     worker.run()